@@ -0,0 +1,65 @@
+"""headless entry point that converts many KV diagrams to \\karnaughmap snippets
+
+usage: python BatchExport.py specs.jsonl -o out_dir --jobs 8
+see KV_Diagramm.KVBatch.KVSpec for the format of a single diagram"""
+import argparse
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import batched
+
+from KV_Diagramm.KVBatch import ExportFailure, KVSpec, export_specs, read_specs
+
+def export_all(specs: Iterable[KVSpec], out_dir: str, jobs: int, chunk_size: int, failures: list[ExportFailure]) -> Iterator[str]:
+    """exports the specs on a pool of jobs processes and yields the written paths as soon as they are done
+    the specs that couldn't be exported are appended to failures
+    at most 2 chunks per process are in flight, so the specs are read lazily and nothing gets collected"""
+    chunks = batched(enumerate(specs), chunk_size)
+    if jobs == 1:
+        for chunk in chunks:
+            paths, chunk_failures = export_specs(list(chunk), out_dir)
+            failures.extend(chunk_failures)
+            yield from paths
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending: set[Future[tuple[list[str], list[ExportFailure]]]] = set()
+        for chunk in chunks:
+            if len(pending) >= 2 * jobs:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from _collect(done, failures)
+            pending.add(pool.submit(export_specs, list(chunk), out_dir))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from _collect(done, failures)
+
+def _collect(done: Iterable[Future[tuple[list[str], list[ExportFailure]]]], failures: list[ExportFailure]) -> Iterator[str]:
+    for future in done:
+        paths, chunk_failures = future.result()
+        failures.extend(chunk_failures)
+        yield from paths
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="converts a json/jsonl file of KV diagrams into .tex files")
+    parser.add_argument("spec", help="a .jsonl file with one diagram per line or a .json file with a list of diagrams")
+    parser.add_argument("-o", "--out-dir", default=".", help="directory the .tex files get written to")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=16, help="number of diagrams a worker renders per task")
+    parser.add_argument("-q", "--quiet", action="store_true", help="don't print the written paths")
+    args = parser.parse_args()
+    if args.jobs < 1 or args.chunk_size < 1:
+        parser.error("--jobs and --chunk-size need to be at least 1")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    failures: list[ExportFailure] = []
+    for path in export_all(read_specs(args.spec), args.out_dir, args.jobs, args.chunk_size, failures):
+        if not args.quiet:
+            print(path)
+    if failures:
+        print(f"{len(failures)} diagram(s) couldn't be exported:", file=sys.stderr)
+        for position, name, error in sorted(failures):
+            print(f"  #{position} {name}: {error}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
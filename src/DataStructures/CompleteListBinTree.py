@@ -1,5 +1,16 @@
 from collections import deque
 from collections.abc import Callable, Iterable, Iterator
+from functools import cache
+
+@cache
+def layer_indices(height: int) -> tuple[tuple[int, ...], ...]:
+    """the list indices of the nodes of every layer of a tree with the given height (layer 0 are the leafes), left to right
+    the nodes are stored in preorder, so a layer is the layer of the left subtree moved by 1 and the one of the right subtree moved by 2**(height - 1)"""
+    if height <= 0:
+        return ()
+    below = layer_indices(height - 1)
+    right_offset: int = 2**(height - 1)
+    return tuple(tuple(i + 1 for i in layer) + tuple(i + right_offset for i in layer) for layer in below) + ((0,),)
 
 class CompleteListBinTree[T]:
     """a Binary Tree that is always complete and realised with a list
@@ -7,9 +18,9 @@ class CompleteListBinTree[T]:
     it is optimized to:
     - add a new root and then completing the tree again by generating new nodes with the factory; O(n*factory())
     - remove a root and delete it alongside the right subtree of th root using the deleter; O(n/2) + O(deleter(n/2))
-    - get the tree elements layer by layer; O(2n)
+    - get the tree elements layer by layer; O(n) after the tree changed, O(1) until it changes again
     - get the height of the tree; O(1)
-    - get a specific layer; O(2h) (where h is the number of elements in the layer)
+    - get a specific layer; O(1) (the layers are gathered once with the cached indices of layer_indices)
 
     :param factory: a factory function that generates an element (the parameter is the height of the element)
     :type factory: Callable[[int], T]
@@ -22,6 +33,8 @@ class CompleteListBinTree[T]:
         self._factory = factory
         self._deleter = deleter
         self._nodes: deque[T] = deque()
+        #the nodes of every layer (layer 0 first), None after the tree changed
+        self.__layers: tuple[tuple[T, ...], ...] | None = None
 
     @property
     def height(self) -> int:
@@ -35,11 +48,13 @@ class CompleteListBinTree[T]:
             self._nodes.appendleft(new_roots[i - self.__height] if i - self.__height < len(new_roots) else self._factory(i))
             self._nodes.extend(self._factory(height) for height in self.__get_heights(i - 1))
         self.__height += num_layers
+        self.__layers = None
     
     def add_layer(self, new_root: T) -> None:
         self._nodes.appendleft(new_root)
         self._nodes.extend(self._factory(height) for height in self.__get_heights(self.__height - 1))
         self.__height += 1
+        self.__layers = None
 
     def remove_layers(self, num_layers: int = 1) -> None:
         assert(num_layers > 0)
@@ -52,6 +67,7 @@ class CompleteListBinTree[T]:
             subtrees_to_delete.extend(self._nodes.pop() for _ in range(len(self._nodes) // 2, len(self._nodes)))
         self._deleter(roots_to_delete, subtrees_to_delete)
         self.__height -= num_layers
+        self.__layers = None
     
     def resize(self, desired_layer_count: int, *new_roots: T) -> None:
         difference = self.__height - desired_layer_count
@@ -64,44 +80,24 @@ class CompleteListBinTree[T]:
         roots_to_delete: list[T] = [self._nodes.popleft() for _ in range(self.__height)]
         subtrees_to_delete = self._nodes
         self._nodes = deque()
+        self.__height = 0
+        self.__layers = None
         self._deleter(roots_to_delete, subtrees_to_delete)
 
-    def get_tree_layers(self) -> Iterator[list[T]]:
-        if not self._nodes:
-            return
-        index_queue: deque[int] = deque((0,))
-        holder: list[T] = []
-        temp: int = 1
-        while index_queue:
-            index = index_queue.popleft()
-            holder.append(self._nodes[index])
-            index_queue.extend(i for i in self.__get_children(index, temp.bit_length()))
-            if len(holder) == temp:
-                yield holder
-                holder = []
-                temp <<= 1
+    @property
+    def layers(self) -> tuple[tuple[T, ...], ...]:
+        """the nodes of every layer, layer 0 (the leafes) first"""
+        if self.__layers is None:
+            nodes: list[T] = list(self._nodes)
+            self.__layers = tuple(tuple(nodes[i] for i in layer) for layer in layer_indices(self.__height))
+        return self.__layers
+
+    def get_tree_layers(self) -> Iterator[tuple[T, ...]]:
+        """the layers from the root to the leafes"""
+        return reversed(self.layers)
     
     def get_tree_layer(self, layer: int) -> Iterator[T]:
-        offset = self.__child_offset(self.__height - layer)
-        index = layer
-        yield self._nodes[index]
-        temp: list[int] = []
-        for i in range(layer):
-            temp = temp + [i] + temp
-        for i in temp:
-            index += offset + i
-            yield self._nodes[index]
-
-    @staticmethod
-    def __child_offset(child_layer: int) -> int:
-        return 2**(child_layer + 1) - 1
-
-    def __get_children(self, node_index: int, layer: int) -> Iterator[int]:
-        assert(node_index >= 0)
-        if layer == self.height:
-            return
-        yield node_index + 1
-        yield node_index + 1 + self.__child_offset(self.__height - layer - 1)
+        return iter(self.layers[layer])
 
     @staticmethod
     def __get_heights(height: int) -> Iterator[int]:
@@ -59,5 +59,6 @@ class KVVarIDs:
             self.__val = None
         self.__tree.resize(0)
 
-    def __iter__(self) -> Iterator[list[LineTextPair]]:
-        return reversed(list(self.__tree.get_tree_layers()))
\ No newline at end of file
+    def __iter__(self) -> Iterator[tuple[LineTextPair, ...]]:
+        """the layers of the tree, the leafes first"""
+        return iter(self.__tree.layers)
\ No newline at end of file
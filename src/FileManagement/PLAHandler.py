@@ -0,0 +1,199 @@
+"""import and export of truth tables as Berkeley PLA (.i/.o/.p/.e) and as CSV
+
+the files are read line by line, every cube is added to the bitsets of a TruthTable right away, so only the bitsets stay in memory.
+input column k is variable k and bit k of the cell index (the way KVData.vars indexes the cells)"""
+import csv
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import TextIO
+
+from KV_Diagramm.Dataclasses.Cube import Cube
+from KV_Diagramm.Dataclasses.KVData import KVData
+from KV_Diagramm.Dataclasses.TruthTable import TruthTable
+
+#2**MAX_INPUTS cells have to fit into the bitsets
+MAX_INPUTS: int = 24
+
+#region cubes
+def cube_cells(cube: Cube) -> int:
+    """the cells of the cube as a bitset (bit i = cell i)
+    the cells of the free variables are the same pattern for every cube with that free_mask, value only shifts it"""
+    return _free_cells(cube.free_mask) << cube.value
+
+@lru_cache(maxsize=1024)
+def _free_cells(free_mask: int) -> int:
+    """every free variable doubles the set with a single shift instead of listing the cells one by one"""
+    cells: int = 1
+    while free_mask:
+        bit = free_mask & -free_mask
+        cells |= cells << bit
+        free_mask ^= bit
+    return cells
+
+def parse_cube(inputs: str) -> Cube:
+    """"1-0" -> Cube (character k is variable k, "-" is free)
+
+    :raises ValueError: if a character isn't 0, 1 or -
+    """
+    free_mask: int = 0
+    value: int = 0
+    for k, char in enumerate(inputs):
+        match char:
+            case "1":
+                value |= 1 << k
+            case "-" | "2":
+                free_mask |= 1 << k
+            case "0":
+                pass
+            case _:
+                raise ValueError(f"{char!r} is not a valid input of the cube {inputs!r}")
+    return Cube(free_mask, value)
+
+def format_cube(cube: Cube, num_vars: int) -> str:
+    return "".join("-" if cube.free_mask >> k & 1 else str(cube.value >> k & 1) for k in range(num_vars))
+#endregion
+#
+#
+#
+#region PLA
+class _TableBuilder:
+    """collects the on, off and don't care cells of a function"""
+    def __init__(self, num_inputs: int, max_inputs: int = MAX_INPUTS) -> None:
+        if not 0 <= num_inputs <= min(max_inputs, MAX_INPUTS):
+            raise ValueError(f"{num_inputs} inputs are not supported (at most {min(max_inputs, MAX_INPUTS)})")
+        self.num_inputs: int = num_inputs
+        self.on: int = 0
+        self.off: int = 0
+        self.dc: int = 0
+
+    def add(self, inputs: str, output: str) -> None:
+        if len(inputs) != self.num_inputs:
+            raise ValueError(f"the cube {inputs!r} needs {self.num_inputs} inputs")
+        match output:
+            case "1" | "4":
+                self.on |= cube_cells(parse_cube(inputs))
+            case "0":
+                self.off |= cube_cells(parse_cube(inputs))
+            case "-" | "2" | "*":
+                self.dc |= cube_cells(parse_cube(inputs))
+            case "~":
+                pass
+            case _:
+                raise ValueError(f"{output!r} is not a valid output")
+
+    def table(self, unspecified_is_off: bool) -> TruthTable:
+        """the on-set wins over the other sets, then the don't cares win over the off-set
+        :param unspecified_is_off: the cells without a cube are off (otherwise they are don't cares)"""
+        all_cells: int = (1 << 2**self.num_inputs) - 1
+        dc: int = self.dc & ~self.on
+        if unspecified_is_off:
+            return TruthTable(2**self.num_inputs, self.on, all_cells & ~(self.on | dc), dc)
+        off: int = self.off & ~(self.on | dc)
+        return TruthTable(2**self.num_inputs, self.on, off, all_cells & ~(self.on | off))
+
+def read_pla(file: TextIO, output: int = 0, max_inputs: int = MAX_INPUTS) -> tuple[list[str] | None, TruthTable]:
+    """reads a PLA with one or more outputs, the values are the ones of the output with the given index
+    the type (.type f, fd, fr or fdr, default fd) decides what the cells without a cube are: off for f and fd, don't care for fr and fdr
+
+    :param max_inputs: files with more inputs are rejected before their cubes get read (at most MAX_INPUTS)
+
+    :return: the input names of .ilb (None if there are none) and the values
+    :raises ValueError: if the file isn't a valid PLA
+    """
+    num_inputs: int | None = None
+    names: list[str] | None = None
+    pla_type: str = "fd"
+    builder: _TableBuilder | None = None
+    for line_number, line in enumerate(file, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        try:
+            if line.startswith("."):
+                keyword, _, argument = line.partition(" ")
+                match keyword:
+                    case ".i":
+                        num_inputs = int(argument)
+                    case ".ilb":
+                        names = argument.split()
+                    case ".type":
+                        pla_type = argument.strip()
+                        if pla_type not in ("f", "fd", "fr", "fdr"):
+                            raise ValueError(f".type {pla_type} is not supported (only f, fd, fr and fdr)")
+                    case ".e" | ".end":
+                        break
+                    case _:
+                        pass #.o, .p, .ob and the rest don't change the values
+                continue
+            if builder is None:
+                if num_inputs is None:
+                    raise ValueError("the cubes start before .i")
+                builder = _TableBuilder(num_inputs, max_inputs)
+            #the inputs and outputs may be written without a space between them
+            fields = line.split()
+            if len(fields) == 1:
+                fields = [line[:builder.num_inputs], line[builder.num_inputs:]]
+            inputs, outputs = fields[0], "".join(fields[1:])
+            if output >= len(outputs):
+                raise ValueError(f"the cube has no output {output}")
+            builder.add(inputs, outputs[output])
+        except ValueError as e:
+            raise ValueError(f"line {line_number}: {e}") from e
+    if builder is None:
+        if num_inputs is None:
+            raise ValueError("the file has no .i")
+        builder = _TableBuilder(num_inputs, max_inputs)
+    if names is not None and len(names) != builder.num_inputs:
+        raise ValueError(f".ilb has {len(names)} names for {builder.num_inputs} inputs")
+    return names, builder.table(unspecified_is_off=pla_type in ("f", "fd"))
+
+def write_pla(file: TextIO, kv_data: KVData, output_name: str = "f") -> None:
+    """writes the markings as the cubes of a sum of products (type f, every marking is one cube)"""
+    cubes: list[Cube] = [m.cube for m in kv_data.markings if m.cube is not None]
+    num_vars: int = kv_data.get_num_vars()
+    file.write(f".i {num_vars}\n.o 1\n")
+    if all(name and not any(c.isspace() for c in name) for name in kv_data.vars):
+        file.write(f".ilb {' '.join(kv_data.vars)}\n")
+    file.write(f".ob {output_name or 'f'}\n.type f\n.p {len(cubes)}\n")
+    file.writelines(f"{format_cube(cube, num_vars)} 1\n" for cube in cubes)
+    file.write(".e\n")
+#endregion
+#
+#
+#
+#region CSV
+def read_csv(file: TextIO, max_inputs: int = MAX_INPUTS) -> tuple[list[str], TruthTable]:
+    """reads a truth table with a header row, the last column is the output and every other column an input
+    the inputs can be 0, 1 or - (a row with - stands for every row it matches), the output 0, 1 or * / - for don't care.
+    cells without a row are off
+
+    :return: the input names of the header and the values
+    :raises ValueError: if the file isn't a valid truth table
+    """
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if not header:
+        raise ValueError("the file has no header")
+    names = [name.strip() for name in header[:-1]]
+    builder = _TableBuilder(len(names), max_inputs)
+    for row in reader:
+        if not row:
+            continue
+        if len(row) != len(header):
+            raise ValueError(f"line {reader.line_num}: expected {len(header)} columns")
+        try:
+            builder.add("".join(cell.strip() for cell in row[:-1]), row[-1].strip())
+        except ValueError as e:
+            raise ValueError(f"line {reader.line_num}: {e}") from e
+    return names, builder.table(unspecified_is_off=True)
+
+def write_csv(file: TextIO, vars: list[str], table: TruthTable, output_name: str = "f") -> None:
+    """writes a row for every cell (unknown values get written as 0)"""
+    writer = csv.writer(file, lineterminator="\n")
+    writer.writerow([*vars, output_name or "f"])
+    writer.writerows(_rows(len(vars), table.to_string()))
+
+def _rows(num_vars: int, vals: str) -> Iterable[list[str]]:
+    for index, value in enumerate(vals):
+        yield [str(index >> k & 1) for k in range(num_vars)] + [value]
+#endregion
@@ -14,17 +14,26 @@ ERROR: str = "Error"
 VAR_WARNING_MSG: str = "entering more then 6 variables,\n can cause performance issues.\nProceed?"
 
 CPY_BUTTON: str = "Copy to clipboard"
+MINIMIZE: str = "Minimize"
+EXPRESSION_ERROR: str = "The expression could not be used:\n{error}"
 
 class SECTIONS:
     TITLE_FRAME_NAME: str = "Title"
     VAR_FRAME_NAME: str = "Variables"
     VALS_FRAME_NAME: str = "Values"
+    EXPRESSION_FRAME_NAME: str = "Expression"
     MARKING_FRAME_NAME: str = "Marking"
 
 class MENUBAR:
     OPTIONS: str = "Options"
     SETTINGS: str = "Settings"
     COLORS: str = "Colors"
+    IMPORT: str = "Import"
+    EXPORT: str = "Export"
+
+class FILES:
+    IMPORT_FAILED: str = "The file could not be imported:\n{error}"
+    EXPORT_FAILED: str = "The file could not be exported:\n{error}"
 
 class COLORS_MENU:
     DESCRIPTION: str = "here you can add/remove colors for the markings in th KV Diagramm.\nIf you add a color make sure that color is Defined in Latex."
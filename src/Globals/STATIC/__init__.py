@@ -1,7 +1,25 @@
-from typing import Callable
-from tkinter import Tk
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable
 
-ROOT: Tk = Tk()
+if TYPE_CHECKING:
+    from tkinter import Tk
+
+_root: Tk | None = None
+
+def get_root() -> Tk:
+    """returns the Tk root and creates it on the first call,
+    so the model and the LaTeX export can be used without tkinter and without a display"""
+    global _root
+    if _root is None:
+        from tkinter import Tk
+        _root = Tk()
+    return _root
+
+def __getattr__(name: str) -> Tk:
+    # keeps "from Globals.STATIC import ROOT" working for the UI, the root only gets created on that import
+    if name == "ROOT":
+        return get_root()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 BG_COLOR: str = "white"
 LINE_COLOR: str = "black"
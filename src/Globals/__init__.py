@@ -1,7 +1,6 @@
-from . import STATIC, DYNAMIC, LANGUAGE, Funcs
+from . import STATIC, DYNAMIC, LANGUAGE
 
 if __name__ == "__main__":
     STATIC.__name__
     DYNAMIC.__name__
-    LANGUAGE.__name__
-    Funcs.__name__
\ No newline at end of file
+    LANGUAGE.__name__
\ No newline at end of file
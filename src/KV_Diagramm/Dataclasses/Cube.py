@@ -0,0 +1,46 @@
+from __future__ import annotations
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+@dataclass(frozen=True, slots=True)
+class Cube:
+    """a block of 2**k cells of a KV diagram (every legal marking is one)
+    free_mask has the k index bits that vary inside the block,
+    value has the bits that all cells share and is 0 on the bits of free_mask
+    (storing the free bits instead of the fixed ones keeps a cube valid when variables get added or removed)"""
+    free_mask: int
+    value: int
+
+    @staticmethod
+    def from_indices(indices: Iterable[int]) -> Cube:
+        """builds the cube of the given cells
+
+        :raises ValueError: if the cells are empty or don't form a cube
+        """
+        indices = set(indices)
+        if not indices:
+            raise ValueError("a cube needs at least one cell")
+        first = next(iter(indices))
+        free_mask: int = 0
+        for index in indices:
+            free_mask |= index ^ first
+        cube = Cube(free_mask, first & ~free_mask)
+        if len(cube) != len(indices):
+            raise ValueError(f"the cells {sorted(indices)} don't form a block of a KV diagram")
+        return cube
+
+    def __contains__(self, index: int) -> bool:
+        return index & ~self.free_mask == self.value
+
+    def __len__(self) -> int:
+        return 1 << self.free_mask.bit_count()
+
+    def indices(self) -> list[int]:
+        """all cells of the cube, generated by doubling the cells along one free bit after the other"""
+        ret: list[int] = [self.value]
+        free_mask = self.free_mask
+        while free_mask:
+            bit = free_mask & -free_mask
+            ret.extend([i | bit for i in ret])
+            free_mask ^= bit
+        return ret
@@ -1,20 +1,45 @@
-from collections.abc import Iterable
+from __future__ import annotations
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from enum import Enum, auto
 
 from Globals import DYNAMIC
+from KV_Diagramm import KVUtils
 
-from .Marking import Marking
-from Shapes.KVMarkings import KVMarkings
+from .Cube import Cube
+from .Marking import Marking, MarkingData
+from .TruthTable import TruthTable
+
+class KVDataEvent(Enum):
+    MARKING_ADDED = auto()
+    MARKING_REMOVED = auto()
+    #the cube (and with it the drawables) of the marking changed
+    MARKING_CHANGED = auto()
+    MARKING_COLOR_CHANGED = auto()
+    MARKING_SELECTED = auto()
+    VARS_CHANGED = auto()
+    VALS_CHANGED = auto()
+
+#gets the event and the marking it is about (None for the vars and vals events)
+KVDataListener = Callable[[KVDataEvent, Marking | None], None]
 
 @dataclass
 class KVData:
-    _kv_markings: KVMarkings
+    """the model of a KV diagram, it doesn't know about any canvas
+    every change made through its methods is sent to the subscribed listeners (e.g. a KVDrawer),
+    assigning the fields directly changes the data without telling anyone (fine for headless use)"""
     vals: str = ""
     vars: list[str] = field(default_factory=lambda: [])
     _selected: int = -1
     width: int = 0
     height: int = 0
     _markings: list[Marking] = field(default_factory=lambda: [])
+    _listeners: list[KVDataListener] = field(default_factory=lambda: [], repr=False, compare=False)
+    #the events of a batch, None outside of batch
+    _batched_events: list[tuple[KVDataEvent, Marking | None]] | None = field(default=None, repr=False, compare=False)
+    #(vals, truth table of vals)
+    _truth_table: tuple[str, TruthTable] | None = field(default=None, repr=False, compare=False)
 
     @property
     def selected(self) -> int:
@@ -29,21 +54,103 @@ class KVData:
     @property
     def len_markings(self) -> int:
         return len(self._markings)
+    @property
+    def truth_table(self) -> TruthTable:
+        """vals as bitsets with a cell for every cell of the diagram, built again only when vals or the number of variables changed
+        (use it for anything that analyses the values)"""
+        num_cells: int = 2**self.get_num_vars()
+        if self._truth_table is None or self._truth_table[1].num_cells != num_cells or self._truth_table[0] != self.vals:
+            self._truth_table = (self.vals, TruthTable.from_string(self.vals, num_cells))
+        return self._truth_table[1]
+
+    #region change notifications
+    def subscribe(self, listener: KVDataListener) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: KVDataListener) -> None:
+        self._listeners.remove(listener)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """holds the events back until the end of the with block and sends each of them only once, at its last position
+        (e.g. a marking that changes 3 times in the block gets a single MARKING_CHANGED)"""
+        if self._batched_events is not None:
+            yield
+            return
+        self._batched_events = []
+        try:
+            yield
+        finally:
+            events, self._batched_events = self._batched_events, None
+            last: dict[tuple[KVDataEvent, int], int] = {(event, id(marking)): i for i, (event, marking) in enumerate(events)}
+            for i, (event, marking) in enumerate(events):
+                if last[(event, id(marking))] == i:
+                    self.__send(event, marking)
+
+    def __notify(self, event: KVDataEvent, marking: Marking | None = None) -> None:
+        if self._batched_events is not None:
+            self._batched_events.append((event, marking))
+        else:
+            self.__send(event, marking)
+
+    def __send(self, event: KVDataEvent, marking: Marking | None) -> None:
+        for listener in self._listeners:
+            listener(event, marking)
+    #endregion
 
-    def add_marking(self, latex_color: str, tag: str, index: int = -1) -> None:
+    def set_vars(self, vars: list[str]) -> None:
+        self.vars = vars
+        dimensions = KVUtils.get_kv_dimensions(self.get_num_vars())
+        if dimensions != (self.width, self.height):
+            self.width, self.height = dimensions
+            for marking in self._markings:
+                marking.drawables = MarkingData.from_cube(marking.cube, self.width, self.height)
+        self.__notify(KVDataEvent.VARS_CHANGED)
+
+    def set_vals(self, vals: str) -> None:
+        self.vals = vals
+        self.__notify(KVDataEvent.VALS_CHANGED)
+
+    def add_marking(self, latex_color: str, tag: str, index: int = -1) -> Marking:
         marking = Marking(latex_color, tag)
         if index < 0:
             self._markings.append(marking)
-            self._kv_markings.new_marking(marking)
         else:
             self._markings.insert(index, marking)
-            self._kv_markings.new_marking(marking)
+        self.__notify(KVDataEvent.MARKING_ADDED, marking)
+        return marking
 
     def remove_marking(self, index: int):
         marking = self._markings.pop(index)
-        self._kv_markings.delete_marking(marking.TAG)
+        self.__notify(KVDataEvent.MARKING_REMOVED, marking)
         self.__adjust_selected()
 
+    def set_marking_cube(self, marking: Marking, cube: Cube | None) -> None:
+        """sets the cells of the marking (None clears it)"""
+        marking.cube = cube
+        marking.expansion_order = KVData.__expansion_order(marking.expansion_order, cube)
+        marking.drawables = MarkingData.from_cube(cube, self.width, self.height)
+        self.__notify(KVDataEvent.MARKING_CHANGED, marking)
+
+    @staticmethod
+    def __expansion_order(order: tuple[int, ...], cube: Cube | None) -> tuple[int, ...]:
+        """keeps the order of the bits that stay free, new free bits get added from the lowest to the highest
+        (an expansion adds a single bit, so it ends up last)"""
+        free_mask: int = 0 if cube is None else cube.free_mask
+        kept: tuple[int, ...] = tuple(bit for bit in order if free_mask >> bit & 1)
+        for bit in kept:
+            free_mask &= ~(1 << bit)
+        added: list[int] = []
+        while free_mask:
+            lowest = free_mask & -free_mask
+            added.append(lowest.bit_length() - 1)
+            free_mask ^= lowest
+        return kept + tuple(added)
+
+    def set_marking_color(self, marking: Marking, latex_color: str) -> None:
+        marking.latex_color = latex_color
+        self.__notify(KVDataEvent.MARKING_COLOR_CHANGED, marking)
+
     def __adjust_selected(self) -> None:
         if not self._markings:
             self._selected = -1
@@ -52,13 +159,19 @@ class KVData:
                 self._selected += len(self._markings)
             while self._selected >= len(self._markings):
                 self._selected -= len(self._markings)
-        self._kv_markings.update_selected(self.get_selected_marking())
+            self.__notify(KVDataEvent.MARKING_SELECTED, self.get_selected_marking())
 
     def get_num_vars(self) -> int:
         return len(self.vars)
-    
+
     def get_selected_marking(self) -> Marking:
         return self._markings[self.selected]
-    
+
+    def get_marking(self, index: int) -> Marking:
+        return self._markings[index]
+
+    def select_marking(self, marking: Marking) -> None:
+        self.selected = next(i for i, m in enumerate(self._markings) if m is marking)
+
     def update_colors(self):
-        [self.remove_marking(i) for i, m in enumerate(self._markings) if m.latex_color not in DYNAMIC.Colors]
\ No newline at end of file
+        [self.remove_marking(i) for i, m in enumerate(self._markings) if m.latex_color not in DYNAMIC.Colors]
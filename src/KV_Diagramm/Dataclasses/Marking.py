@@ -2,6 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from Globals import DYNAMIC
 
+from .Cube import Cube
 from .Edge import Edge
 from KV_Diagramm import KVUtils
 
@@ -13,25 +14,68 @@ class MarkingData:
     y2: float
     edges: Edge
 
+    @staticmethod
+    def from_cube(cube: Cube | None, width: int, height: int) -> list[MarkingData]:
+        """closed form of from_indices for cubes
+        the even bits of an index are the gray coded x coordinate and the odd bits the y coordinate,
+        so the columns and the rows of a cube are independent of each other and every block is a pair of a column run and a row run.
+        the runs only need the positions along each axis and not every cell"""
+        if cube is None:
+            return []
+        free_x, free_y = KVUtils.split_int_binary(cube.free_mask)
+        value_x, value_y = KVUtils.split_int_binary(cube.value)
+        columns = MarkingData.__axis_runs(free_x, value_x, width, Edge.LEFT, Edge.RIGHT)
+        rows = MarkingData.__axis_runs(free_y, value_y, height, Edge.TOP, Edge.BOTTOM)
+        return [MarkingData(x1, y1, x2, y2, x_edges | y_edges) for y1, y2, y_edges in rows for x1, x2, x_edges in columns]
+
+    @staticmethod
+    def __axis_runs(free_gray: int, value_gray: int, size: int, low_edge: Edge, high_edge: Edge) -> list[tuple[int, int, Edge]]:
+        """the runs of consecutive positions along one axis with the edges they need
+        (an edge is left open if the run wraps around to the other side)"""
+        gray_codes: list[int] = [value_gray]
+        while free_gray:
+            bit = free_gray & -free_gray
+            gray_codes.extend([g | bit for g in gray_codes])
+            free_gray ^= bit
+        positions: list[int] = sorted(KVUtils.inv_gray_code(g) for g in gray_codes)
+        wraps: bool = positions[0] == 0 and positions[-1] == size - 1
+
+        runs: list[tuple[int, int, Edge]] = []
+        start: int = positions[0]
+        for previous, position in zip(positions, positions[1:] + [-1]):
+            if position == previous + 1:
+                continue
+            end = previous + 1
+            edges: Edge = Edge.NONE
+            if not (start == 0 and wraps):
+                edges |= low_edge
+            if not (end == size and wraps):
+                edges |= high_edge
+            runs.append((start, end, edges or low_edge | high_edge))
+            start = position
+        return runs
+
     @staticmethod
     def from_indices(indices: list[int], width: int, height: int) -> list[MarkingData]:
+        """splits any set of cells into rectangles with a flood fill (from_cube is faster for cubes)"""
         idx_set: set[int] = set(indices)
         ret: list[MarkingData] = []
         kv_max_x = width - 1
         kv_max_y = height - 1
+        index_table = KVUtils.coordinate_to_index_table(KVUtils.vars_for_cells(width * height))
         for block in KVUtils.make_blocks(indices):
             (x1,y1), (x2,y2) = MarkingData.__get_rect_bounds(block)
             openings: Edge = Edge.NONE
-            if not(x1 == 0 and KVUtils.CoordinateToIndex(kv_max_x, y1) in idx_set):
+            if not(x1 == 0 and index_table[y1][kv_max_x] in idx_set):
                 openings |= Edge.LEFT
-            if not(x2 == width and KVUtils.CoordinateToIndex(0, y1) in idx_set):
+            if not(x2 == width and index_table[y1][0] in idx_set):
                 openings |= Edge.RIGHT
             if Edge.LEFT not in openings and Edge.RIGHT not in openings:
                 openings |= Edge.RIGHT | Edge.LEFT
 
-            if not(y1 == 0 and KVUtils.CoordinateToIndex(x1, kv_max_y) in idx_set):
+            if not(y1 == 0 and index_table[kv_max_y][x1] in idx_set):
                 openings |= Edge.TOP
-            if not(y2 == height and KVUtils.CoordinateToIndex(x1, 0) in idx_set):
+            if not(y2 == height and index_table[0][x1] in idx_set):
                 openings |= Edge.BOTTOM
             if Edge.TOP not in openings and Edge.BOTTOM not in openings:
                 openings |= Edge.TOP | Edge.BOTTOM
@@ -52,12 +96,18 @@ class MarkingData:
 class Marking:
     latex_color: str
     _TAG: str
-    indices: list[int] =  field(default_factory=lambda: list[int]())
+    cube: Cube | None = None
     drawables: list[MarkingData] = field(default_factory=lambda: [])
+    #the free bits of cube in the order they were added, a right click removes the last one first
+    expansion_order: tuple[int, ...] = ()
     @property
     def TAG(self) -> str:
         return self._TAG
+
+    @property
+    def indices(self) -> list[int]:
+        return [] if self.cube is None else self.cube.indices()
     
     @property
     def tkinter_color(self) -> str:
-        return DYNAMIC.Colors[self.latex_color]
\ No newline at end of file
+        return DYNAMIC.Colors[self.latex_color]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+ONE: str = "1"
+ZERO: str = "0"
+DONT_CARE: str = "*"
+
+def _digit_table(char: str) -> bytes:
+    """translation table that turns char into b"1" and every other byte into b"0" """
+    table = bytearray(b"0" * 256)
+    table[ord(char)] = ord("1")
+    return bytes(table)
+
+_ON_DIGITS: bytes = _digit_table(ONE)
+_OFF_DIGITS: bytes = _digit_table(ZERO)
+_DC_DIGITS: bytes = _digit_table(DONT_CARE)
+#the digits to_string builds: 0 = off (or unknown), 1 = on, 2 = don't care
+_CHARS: bytes = bytes.maketrans(b"012", f"{ZERO}{ONE}{DONT_CARE}".encode())
+
+@dataclass(frozen=True, slots=True)
+class TruthTable:
+    """the values of a KV diagram as bitsets, bit i of a set is the cell of index i
+    a cell is in at most one of on, off and dc, cells in none of them have an unknown value (any other character of the values string)"""
+    num_cells: int
+    on: int
+    off: int
+    dc: int
+
+    @staticmethod
+    def from_string(vals: str, num_cells: int | None = None) -> TruthTable:
+        """reads "1", "0" and "*" of vals, values beyond num_cells get cut off (missing values are unknown)
+        every set is built with a translate and an int(..., 2) instead of a loop over the characters"""
+        data: bytes = vals[:num_cells].encode("ascii", "replace")
+        num_cells = len(vals) if num_cells is None else num_cells
+        def bits(digits: bytes) -> int:
+            return int(data.translate(digits)[::-1], 2) if data else 0
+        return TruthTable(num_cells, bits(_ON_DIGITS), bits(_OFF_DIGITS), bits(_DC_DIGITS))
+
+    def to_string(self) -> str:
+        """the values as "1", "0" and "*" (unknown values become "0")
+        the digits of on and dc are added as big ints, so the string is built without a loop over the cells"""
+        if not self.num_cells:
+            return ""
+        def digits(bits: int) -> int:
+            return int.from_bytes(format(bits, f"0{self.num_cells}b").encode())
+        zeros: int = int.from_bytes(b"0" * self.num_cells)
+        combined: int = digits(self.on) + 2 * (digits(self.dc) - zeros)
+        return combined.to_bytes(self.num_cells).translate(_CHARS).decode()[::-1]
+
+    @property
+    def all_cells(self) -> int:
+        return (1 << self.num_cells) - 1
+
+    @property
+    def unknown(self) -> int:
+        return self.all_cells & ~(self.on | self.off | self.dc)
+
+    def __getitem__(self, index: int) -> str:
+        """the value of a single cell ("?" if it is unknown)"""
+        if not 0 <= index < self.num_cells:
+            raise IndexError(f"cell {index} is not part of a table of {self.num_cells} cells")
+        bit: int = 1 << index
+        if self.on & bit:
+            return ONE
+        if self.off & bit:
+            return ZERO
+        if self.dc & bit:
+            return DONT_CARE
+        return "?"
+
+    def count(self, value: str) -> int:
+        """the number of cells with value ("1", "0" or "*")"""
+        return {ONE: self.on, ZERO: self.off, DONT_CARE: self.dc}[value].bit_count()
+
+    def diff(self, other: TruthTable) -> int:
+        """the cells whose value differs between the tables (a cell that only one of them has counts as different)"""
+        return (self.on ^ other.on) | (self.off ^ other.off) | (self.dc ^ other.dc) | (self.all_cells ^ other.all_cells)
+
+    def resized(self, num_cells: int) -> TruthTable:
+        """the table cut to (or padded with unknown values up to) num_cells"""
+        mask: int = (1 << num_cells) - 1
+        return TruthTable(num_cells, self.on & mask, self.off & mask, self.dc & mask)
+
+    @staticmethod
+    def indices(bits: int) -> Iterator[int]:
+        """the indices of the set bits of a set (e.g. of on or of a diff) from low to high"""
+        while bits:
+            bit = bits & -bits
+            yield bit.bit_length() - 1
+            bits ^= bit
@@ -0,0 +1,55 @@
+from collections.abc import Callable, Hashable
+from tkinter import Misc, StringVar
+
+class CoalescedInput:
+    """applies the writes of a StringVar in bursts instead of on every keystroke
+    every write replaces the value that is still waiting, so only the last one of a burst gets applied.
+    a write that keeps the structure of the applied value (same structure key, e.g. the number of variables)
+    gets applied on idle (after delay_ms), one that changes the structure only once it stopped changing for structural_delay_ms"""
+    def __init__(self, widget: Misc, variable: StringVar, apply: Callable[[str], None], structure: Callable[[str], Hashable] = len, delay_ms: int = 0, structural_delay_ms: int = 250) -> None:
+        """:param widget: the widget that schedules the callbacks
+        :param apply: gets the value of the burst
+        :param structure: two values with the same key only differ in text that can be changed in place
+        """
+        self.delay_ms: int = delay_ms
+        self.structural_delay_ms: int = structural_delay_ms
+        self.__widget: Misc = widget
+        self.__variable: StringVar = variable
+        self.__apply: Callable[[str], None] = apply
+        self.__structure: Callable[[str], Hashable] = structure
+        self.__applied: str | None = None
+        self.__after_id: str = ""
+        #writes that got replaced by a later one before they were applied
+        self.skipped: int = 0
+        variable.trace_add('write', lambda name, index, mode: self.__schedule())
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.__after_id)
+
+    def set(self, value: str) -> None:
+        """writes value into the variable and applies it right away (e.g. for values that weren't typed)"""
+        self.__variable.set(value)
+        self.flush()
+
+    def flush(self) -> None:
+        """applies the waiting value right away (does nothing if it already is applied)"""
+        if self.__after_id:
+            self.__widget.after_cancel(self.__after_id)
+            self.__after_id = ""
+        value: str = self.__variable.get()
+        if value == self.__applied:
+            return
+        self.__applied = value
+        self.__apply(value)
+
+    def __schedule(self) -> None:
+        if self.__after_id:
+            self.__widget.after_cancel(self.__after_id)
+            self.skipped += 1
+        structural: bool = self.__applied is None or self.__structure(self.__variable.get()) != self.__structure(self.__applied)
+        delay: int = self.structural_delay_ms if structural else self.delay_ms
+        if delay > 0:
+            self.__after_id = self.__widget.after(delay, self.flush)
+        else:
+            self.__after_id = self.__widget.after_idle(self.flush)
@@ -0,0 +1,81 @@
+import json
+import os
+from collections.abc import Iterator
+from itertools import cycle
+from typing import Any
+
+from Globals import DYNAMIC
+
+from . import KVMinimizer
+from .KVToLaTeX import get_kv_string
+from .Dataclasses.Cube import Cube
+from .Dataclasses.KVData import KVData
+
+KVSpec = dict[str, Any]
+"""a single diagram of a batch, e.g.:
+{"name": "task_1", "title": "f", "vars": "A,B,C", "vals": "01101001", "markings": [{"color": "red", "indices": [1, 3]}]}
+only "vars" is required, "vars" can be a list or a comma separated string
+with "minimize": true the markings are generated from the values instead of being read from markings"""
+
+def read_specs(path: str) -> Iterator[KVSpec]:
+    """yields the diagram specs of a file
+    .jsonl files are read line by line (one spec per line),
+    any other file is read as json holding either one spec or a list of specs"""
+    with open(path) as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        contents = json.load(f)
+    if isinstance(contents, dict):
+        yield contents
+    else:
+        yield from contents
+
+def build_kv_data(spec: KVSpec) -> KVData:
+    vars = spec["vars"]
+    if isinstance(vars, str):
+        vars = vars.split(",")
+    kv_data = KVData(vals=spec.get("vals", ""))
+    kv_data.set_vars(list(vars))
+
+    if spec.get("minimize", False):
+        num_vars = kv_data.get_num_vars()
+        markings: list[tuple[str | None, Cube]] = [
+            (None, KVMinimizer.implicant_to_cube(implicant, num_vars)) for implicant in KVMinimizer.minimize(kv_data.truth_table, num_vars)
+        ]
+    else:
+        markings = [(marking_spec.get("color"), Cube.from_indices(marking_spec["indices"])) for marking_spec in spec.get("markings", ())]
+
+    colors = cycle(DYNAMIC.Colors)
+    for index, (color, cube) in enumerate(markings):
+        kv_data.set_marking_cube(kv_data.add_marking(color or next(colors), f"marking_{index}"), cube)
+    return kv_data
+
+def render_spec(spec: KVSpec) -> str:
+    return get_kv_string(build_kv_data(spec), spec.get("title", ""))
+
+ExportFailure = tuple[int, str, str]
+"""(position in batch, name, error message) of a spec that couldn't be exported"""
+
+def export_specs(jobs: list[tuple[int, KVSpec]], out_dir: str) -> tuple[list[str], list[ExportFailure]]:
+    """renders a chunk of (position in batch, spec) pairs and writes each one to "<out_dir>/<name>.tex"
+    (specs without a name are called kv_<position>)
+    returns the written paths and the specs that failed, this is the function that runs in the worker processes
+    a broken spec (missing "vars", cells that don't form a block, ...) only fails itself and not the whole batch"""
+    paths: list[str] = []
+    failures: list[ExportFailure] = []
+    for position, spec in jobs:
+        name = str(spec.get("name", f"kv_{position}")) if isinstance(spec, dict) else f"kv_{position}"
+        try:
+            kv_string = render_spec(spec)
+            path = os.path.join(out_dir, f"{name}.tex")
+            with open(path, "w") as f:
+                f.write(kv_string)
+        except Exception as error:
+            #only the message is sent back, not every exception can be pickled
+            failures.append((position, name, f"{type(error).__name__}: {error}"))
+            continue
+        paths.append(path)
+    return paths, failures
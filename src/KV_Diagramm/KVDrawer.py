@@ -1,13 +1,18 @@
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable
 from enum import IntFlag
 from tkinter import Canvas
 
-from KV_Diagramm.Dataclasses.KVData import KVData
+from KV_Diagramm.Dataclasses.KVData import KVData, KVDataEvent
 
 from .Dataclasses.Marking import Marking
+from Profiling.Tracer import TRACER, traced
+from Shapes.CanvasRender import BatchedRender, DirectRender, TclCallCounter
+from Shapes.FontSizes import BucketFont
 from Shapes.KVIndices import KVIndices
 from Shapes.KVGrid import KVGrid
 from Shapes.KVMarkings import KVMarkings
+from Shapes.LinePool import LinePool
+from Shapes.KVTiledGrid import TILE_VARS, KVTiledGrid
 from Shapes.KVValues import KVValues
 from Shapes.KVVars import KVVars
 
@@ -25,63 +30,194 @@ class GridUpdateMode(IntFlag):
     NEW_DIM_UPDATE = 3
 
 class KVDrawer:
-    def __init__(self, canvas: Canvas, kv_markings: KVMarkings) -> None:
+    #below these cell sizes (in pixels) the texts are too small to read and don't get drawn at all
+    INDEX_MIN_CELL_SIZE: float = 36
+    VALUE_MIN_CELL_SIZE: float = 12
+    #from this many variables on the diagram gets drawn as a grid of 4 variable diagrams
+    TILED_MIN_VARS: int = 7
+    #the most variables the canvas can draw without freezing (every cell is a text item)
+    MAX_VARS: int = 12
+
+    def __init__(self, canvas: Canvas, batched: bool = True, scale_on_resize: bool = True, tiled: bool = True, polyline_markings: bool = True) -> None:
+        """:param batched: send the changes of a frame as one Tcl script instead of one call per change
+        :param scale_on_resize: while the canvas gets resized, scale the drawn items with the canvas instead of laying them out again
+        :param tiled: draw diagrams with TILED_MIN_VARS or more variables as tiles (see KVTiledGrid)
+        :param polyline_markings: draw every rectangle of a marking as one line item instead of one per edge (see KVMarkings)"""
         self.__canvas: Canvas = canvas
-        self.__kv_grid: KVGrid = KVGrid(canvas)
-        self.__kv_vars: KVVars = KVVars(canvas)
-        self.__kv_values: KVValues = KVValues(canvas)
-        self.__kv_indices: KVIndices = KVIndices(canvas)
-        self.__kv_markings: KVMarkings = kv_markings
+        self.__tcl_calls: TclCallCounter = TclCallCounter(canvas)
+        TRACER.watch(self.__tcl_calls)
+        self.__render: DirectRender = BatchedRender(canvas) if batched else DirectRender(canvas)
+        self.__plain_grid: KVGrid = KVGrid(canvas, render=self.__render)
+        self.__tiled_grid: KVTiledGrid = KVTiledGrid(canvas, render=self.__render)
+        self.__kv_grid: KVGrid = self.__plain_grid
+        self.__tiled: bool = tiled
+        self.__kv_vars: KVVars = KVVars(canvas, self.__render)
+        self.__kv_values: KVValues = KVValues(canvas, self.__render)
+        self.__kv_indices: KVIndices = KVIndices(canvas, self.__render)
+        self.__kv_markings: KVMarkings = KVMarkings(canvas, self.__render, polyline_markings)
         self.draw_flags: KVFlags = KVFlags.NONE
         self.__width: int = canvas.winfo_width()
         self.__height: int = canvas.winfo_height()
         self.__resize_id: str = ""
-    
+        self.__scale_on_resize: bool = scale_on_resize
+        self.__frame_round_trips: int = 0
+        self.__frame_font_switches: int = 0
+        #the number of variables the grid was last laid out for
+        self.__num_vars: int = 0
+
+    def attach(self, kv_data: KVData) -> None:
+        """subscribes the drawer to the changes of kv_data, from then on every change made through kv_data gets drawn"""
+        kv_data.subscribe(self.__kv_markings.on_kv_data_changed)
+        kv_data.subscribe(lambda event, marking: self.__on_kv_data_changed(kv_data, event, marking))
+
+    def __on_kv_data_changed(self, kv_data: KVData, event: KVDataEvent, marking: Marking | None) -> None:
+        match event:
+            case KVDataEvent.MARKING_CHANGED if marking is not None:
+                self.update(kv_data, changed_markings=[marking])
+            case KVDataEvent.VALS_CHANGED:
+                self.update(kv_data, new_values=kv_data.vals)
+            case KVDataEvent.VARS_CHANGED:
+                grid_mode: GridUpdateMode = GridUpdateMode.UPDATE if kv_data.get_num_vars() != self.__num_vars else GridUpdateMode.NONE
+                self.__num_vars = kv_data.get_num_vars()
+                self.update(kv_data, new_vars=kv_data.vars, draw_grid=grid_mode)
+            case _:
+                #the rest is handled by KVMarkings (subscribed before the drawer), its changes still need to reach the canvas
+                self.__render.flush()
+
+    def highlight_markings(self, tags: Collection[str]) -> None:
+        """draws the markings of tags highlighted (e.g. the ones under the mouse) and every other one normal"""
+        self.__kv_markings.set_hovered(tags)
+        self.__render.flush()
+
+    @property
+    def line_pool(self) -> LinePool:
+        """the pool of the marking edges (size and hit rate)"""
+        return self.__kv_markings.line_pool
+
+    @property
+    def frame_round_trips(self) -> int:
+        """the number of Python to Tcl round trips of the last frame (update)"""
+        return self.__frame_round_trips
+
+    @property
+    def frame_font_switches(self) -> int:
+        """the number of font switches of the last frame (update or scaling step of a resize)"""
+        return self.__frame_font_switches
+
+    @traced("KVDrawer.draw")
     def draw(self, markings: Iterable[Marking] = ()) -> None:
         if KVFlags.GRID in self.draw_flags:
-            self.__kv_grid.draw(self.__width, self.__height)
+            with TRACER.span("GRID"):
+                self.__kv_grid.draw(self.__width, self.__height)
         if KVFlags.VARS in self.draw_flags:
-            self.__kv_vars.draw(self.__kv_grid)
+            with TRACER.span("VARS"):
+                self.__kv_vars.draw(self.__kv_grid)
+        cell_size: float = self.__kv_grid.cell_size
         if KVFlags.VALS in self.draw_flags:
-            self.__kv_values.draw(self.__kv_grid)
+            with TRACER.span("VALS"):
+                self.__kv_values.draw(self.__kv_grid, cell_size >= KVDrawer.VALUE_MIN_CELL_SIZE)
         if KVFlags.IDXS in self.draw_flags:
-            self.__kv_indices.draw(self.__kv_grid)
+            with TRACER.span("IDXS"):
+                self.__kv_indices.draw(self.__kv_grid, cell_size >= KVDrawer.INDEX_MIN_CELL_SIZE)
         if markings:
-            [self.__kv_markings.draw_marking(self.__kv_grid, m) for m in markings]
+            with TRACER.span("markings"):
+                [self.__kv_markings.draw_marking(self.__kv_grid, m) for m in markings]
+        with TRACER.span("flush"):
+            self.__render.flush()
         self.draw_flags = KVFlags.NONE
     
+    @traced("KVDrawer.update")
     def update(self, kv_data: KVData, new_vars: list[str] | None = None, new_values: str | None = None, changed_markings: list[Marking] | None = None, draw_grid: GridUpdateMode = GridUpdateMode.NONE) -> None:
+        tcl_calls_before: int = self.__tcl_calls.count
+        font_switches_before: int = BucketFont.switches
+        line_pool: LinePool = self.__kv_markings.line_pool
+        pool_hits_before, pool_misses_before = line_pool.hits, line_pool.misses
+        if GridUpdateMode.UPDATE in draw_grid:
+            self.__select_grid(kv_data)
         if new_vars is not None:
-            self.__kv_vars.update(new_vars)
-            self.draw_flags |= KVFlags.VARS
+            if self.__kv_grid is self.__tiled_grid:
+                self.__tiled_grid.update_tiles(new_vars)
+                new_vars = new_vars[:TILE_VARS]
+            if self.__kv_vars.update(new_vars):
+                self.draw_flags |= KVFlags.VARS
         if GridUpdateMode.NEW_DIM_UPDATE in draw_grid:
             self.__width = self.__canvas.winfo_width()
             self.__height = self.__canvas.winfo_height()
         if GridUpdateMode.UPDATE in draw_grid:
-            self.__kv_grid.update(kv_data.width, kv_data.height)
+            if self.__kv_grid is self.__plain_grid:
+                self.__kv_grid.update(kv_data.width, kv_data.height)
             self.__kv_indices.update(2**kv_data.get_num_vars())
+            [self.__kv_markings.update_marking(m, self.__kv_grid.marking_rects(m)) for m in kv_data.markings]
             self.draw_flags |= KVFlags.ALL
-        if new_values is not None or KVFlags.VARS in self.draw_flags:
-            self.__kv_values.update(new_values, kv_data.width * kv_data.height)
-            self.draw_flags |= KVFlags.VALS
+        #a renamed variable or a changed value is changed in place, only new or removed texts need a layout
+        if new_values is not None or GridUpdateMode.UPDATE in draw_grid:
+            if self.__kv_values.update(new_values, kv_data.width * kv_data.height):
+                self.draw_flags |= KVFlags.VALS
         if changed_markings is not None:
-            [self.__kv_markings.update_marking(m) for m in changed_markings]
+            [self.__kv_markings.update_marking(m, self.__kv_grid.marking_rects(m)) for m in changed_markings]
             self.draw(changed_markings)
         else:
             self.draw(kv_data.markings if draw_grid else [])
+        self.__frame_round_trips = self.__tcl_calls.count - tcl_calls_before
+        self.__frame_font_switches = BucketFont.switches - font_switches_before
+        TRACER.count(
+            round_trips=self.__frame_round_trips, font_switches=self.__frame_font_switches,
+            line_pool_hits=line_pool.hits - pool_hits_before, line_pool_misses=line_pool.misses - pool_misses_before
+        )
+        TRACER.annotate(line_pool_size=line_pool.size)
     
-    def set_marking_color(self, marking_tag: str, color: str) -> None:
-        self.__kv_markings.set_color(marking_tag, color)
-    
-    def delete_marking(self, marking_tag: str) -> None:
-        self.__kv_markings.delete_marking(marking_tag)
-    
+    def __select_grid(self, kv_data: KVData) -> None:
+        """switches between the plain and the tiled grid, the items of the grid that isn't used get deleted"""
+        use_tiles: bool = self.__tiled and kv_data.get_num_vars() >= KVDrawer.TILED_MIN_VARS
+        grid: KVGrid = self.__tiled_grid if use_tiles else self.__plain_grid
+        if grid is self.__kv_grid:
+            return
+        if use_tiles:
+            self.__plain_grid.update(1, 1)
+        else:
+            self.__tiled_grid.update_tiles([])
+        self.__kv_grid = grid
+
     def schedule_resize(self, kv_data: KVData) -> None:
+        """the exact layout runs once the canvas stopped changing its size for 100ms
+        until then every size change only scales the drawn items (if scale_on_resize is set)"""
         if self.__resize_id:
             self.__canvas.after_cancel(self.__resize_id)
-        self.__resize_id = self.__canvas.after(100, lambda:self.update(kv_data, draw_grid=GridUpdateMode.NEW_DIM_UPDATE))
+        if self.__scale_on_resize and self.__kv_grid.cell_size > 0:
+            tcl_calls_before: int = self.__tcl_calls.count
+            font_switches_before: int = BucketFont.switches
+            self.__scale_to_canvas()
+            self.__frame_round_trips = self.__tcl_calls.count - tcl_calls_before
+            self.__frame_font_switches = BucketFont.switches - font_switches_before
+            TRACER.count(round_trips=self.__frame_round_trips, font_switches=self.__frame_font_switches)
+        self.__resize_id = self.__canvas.after(100, lambda:self.finish_resize(kv_data))
+
+    def finish_resize(self, kv_data: KVData) -> None:
+        """runs the scheduled relayout of a resize (now, if it is still pending)"""
+        if not self.__resize_id:
+            return
+        self.__canvas.after_cancel(self.__resize_id)
+        self.__resize_id = ""
+        self.update(kv_data, draw_grid=GridUpdateMode.NEW_DIM_UPDATE)
+
+    def __scale_to_canvas(self) -> None:
+        """moves every item to the layout of the current canvas size with a single scale and move of the canvas
+        every coordinate is offset + cell_size * something, so this is exact (the fonts are switched separately)"""
+        old_cell_size, old_x_offset, old_y_offset = self.__kv_grid.cell_size, self.__kv_grid.x_offset, self.__kv_grid.y_offset
+        layout = self.__kv_grid.layout(self.__canvas.winfo_width(), self.__canvas.winfo_height())
+        cell_size, x_offset, y_offset = layout
+        if cell_size <= 0:
+            return
+        scale: float = cell_size / old_cell_size
+        self.__render.scale("all", old_x_offset, old_y_offset, scale, scale)
+        self.__render.move("all", x_offset - old_x_offset, y_offset - old_y_offset)
+        self.__kv_grid.set_layout(layout)
+        self.__kv_grid.resize_font(cell_size)
+        self.__kv_vars.resize_font(cell_size)
+        self.__kv_values.resize_font(cell_size)
+        self.__kv_indices.resize_font(cell_size)
+        self.__render.flush()
 
-    def canvas_to_grid_coord(self, canvas_x: int, canvas_y: int) -> tuple[int, int]:
-        new_x: int = int((canvas_x - self.__kv_grid.x_offset) // self.__kv_grid.cell_size)
-        new_y: int = int((canvas_y - self.__kv_grid.y_offset) // self.__kv_grid.cell_size)
-        return new_x, new_y
\ No newline at end of file
+    def canvas_to_kv_index(self, canvas_x: int, canvas_y: int) -> int:
+        """the index of the cell at the canvas position (-1 if there is none)"""
+        return self.__kv_grid.canvas_to_index(canvas_x, canvas_y)
@@ -0,0 +1,142 @@
+"""boolean expressions like "A&!B | C^D" as values of a KV diagram
+
+an expression is parsed once into a tree of closures that works on whole truth tables:
+every variable is a big int with bit i set for every cell index i in which the variable is 1 (vars[k] is bit k of the index,
+the cell order of KVUtils.CoordinateToIndex), so a single & of two ints evaluates the and of every cell at once.
+
+operators from the strongest to the weakest binding: ! ~ (not), & * (and), ^ (xor), | + (or), parentheses group, 0 and 1 are constants.
+a variable name is any run of characters that aren't operators, parentheses or whitespace"""
+from __future__ import annotations
+import re
+from collections.abc import Callable
+from functools import cache
+
+from .Dataclasses.TruthTable import TruthTable
+
+#gets the patterns of the variables by name and the bitset of all cells
+_Node = Callable[[dict[str, int], int], int]
+
+_TOKEN: re.Pattern[str] = re.compile(r"\s*(?:([!~&*^|+()])|([^\s!~&*^|+()]+))")
+NOT: str = "!~"
+AND: str = "&*"
+XOR: str = "^"
+OR: str = "|+"
+
+@cache
+def variable_pattern(bit: int, num_vars: int) -> int:
+    """the bitset of the cells in which index bit is 1: runs of 2**bit zeros and ones, built by doubling instead of per cell"""
+    period: int = 2 << bit
+    pattern: int = ((1 << (1 << bit)) - 1) << (1 << bit)
+    num_cells: int = 1 << num_vars
+    while period < num_cells:
+        pattern |= pattern << period
+        period *= 2
+    return pattern
+
+class Expression:
+    """a compiled boolean expression
+
+    :raises ValueError: if the text isn't a valid expression
+    """
+    def __init__(self, text: str) -> None:
+        self.text: str = text
+        self.names: set[str] = set()
+        self.__tokens: list[str] = self.__tokenize(text)
+        self.__position: int = 0
+        if not self.__tokens:
+            raise ValueError("the expression is empty")
+        try:
+            self.__root: _Node = self.__parse_or()
+        except RecursionError:
+            raise ValueError("the expression is nested too deeply") from None
+        if self.__position < len(self.__tokens):
+            raise ValueError(f"unexpected {self.__tokens[self.__position]!r}")
+
+    def evaluate(self, vars: list[str]) -> TruthTable:
+        """the values of the expression for every cell of a KV diagram with these variables
+
+        :raises ValueError: if the expression uses a name that isn't one of vars or has too many operators in a chain
+        """
+        unknown = self.names - set(vars)
+        if unknown:
+            raise ValueError(f"unknown variables: {', '.join(sorted(unknown))}")
+        num_cells: int = 2**len(vars)
+        all_cells: int = (1 << num_cells) - 1
+        patterns: dict[str, int] = {}
+        #the first of two variables with the same name wins
+        for bit, name in reversed(list(enumerate(vars))):
+            patterns[name] = variable_pattern(bit, len(vars)) & all_cells
+        try:
+            on: int = self.__root(patterns, all_cells) & all_cells
+        except RecursionError:
+            #e.g. hundreds of ! in a row, every operator is a call
+            raise ValueError("the expression is nested too deeply") from None
+        return TruthTable(num_cells, on, all_cells & ~on, 0)
+
+    #region parser
+    @staticmethod
+    def __tokenize(text: str) -> list[str]:
+        tokens: list[str] = []
+        position: int = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if match is None:
+                raise ValueError(f"unexpected {text[position]!r}")
+            tokens.append(match.group(1) or match.group(2))
+            position = match.end()
+        return tokens
+
+    def __peek(self) -> str | None:
+        return self.__tokens[self.__position] if self.__position < len(self.__tokens) else None
+
+    def __take(self) -> str:
+        token = self.__peek()
+        if token is None:
+            raise ValueError("the expression ends too early")
+        self.__position += 1
+        return token
+
+    def __parse_binary(self, operators: str, parse_operand: Callable[[], _Node], combine: Callable[[int, int], int]) -> _Node:
+        node = parse_operand()
+        while (token := self.__peek()) is not None and token in operators:
+            self.__take()
+            node = self.__combine(node, parse_operand(), combine)
+        return node
+
+    @staticmethod
+    def __combine(left: _Node, right: _Node, combine: Callable[[int, int], int]) -> _Node:
+        return lambda patterns, all_cells: combine(left(patterns, all_cells), right(patterns, all_cells))
+
+    def __parse_or(self) -> _Node:
+        return self.__parse_binary(OR, self.__parse_xor, int.__or__)
+
+    def __parse_xor(self) -> _Node:
+        return self.__parse_binary(XOR, self.__parse_and, int.__xor__)
+
+    def __parse_and(self) -> _Node:
+        return self.__parse_binary(AND, self.__parse_not, int.__and__)
+
+    def __parse_not(self) -> _Node:
+        if (token := self.__peek()) is not None and token in NOT:
+            self.__take()
+            operand = self.__parse_not()
+            return lambda patterns, all_cells: all_cells & ~operand(patterns, all_cells)
+        return self.__parse_atom()
+
+    def __parse_atom(self) -> _Node:
+        token = self.__take()
+        if token == "(":
+            node = self.__parse_or()
+            if self.__take() != ")":
+                raise ValueError("missing )")
+            return node
+        if token == "0":
+            return lambda patterns, all_cells: 0
+        if token == "1":
+            return lambda patterns, all_cells: all_cells
+        if len(token) == 1 and token in NOT + AND + XOR + OR + ")":
+            raise ValueError(f"unexpected {token!r}")
+        self.names.add(token)
+        return lambda patterns, all_cells: patterns[token]
+    #endregion
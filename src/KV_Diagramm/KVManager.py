@@ -1,81 +1,206 @@
 from itertools import count
 from tkinter import Canvas, Event, StringVar
+from typing import Any
 
+from FileManagement import PLAHandler
 import IterTools
-from KV_Diagramm import KVUtils
-from KV_Diagramm.KVDrawer import GridUpdateMode, KVDrawer
+from KV_Diagramm import KVMinimizer, KVUtils
+from KV_Diagramm.InputPipeline import CoalescedInput
+from KV_Diagramm.KVDrawer import KVDrawer
+from KV_Diagramm.KVExpression import Expression
+from KV_Diagramm.MarkingIndex import MarkingIndex
+from Profiling.SessionRecorder import SessionRecorder
+from Profiling.Tracer import traced
 from UI.KVColorsMenu import KVColorsMenu
 from .KVToLaTeX import get_kv_string
 
-from .Dataclasses.KVData import KVData
-from .Dataclasses.Marking import Marking, MarkingData
-
-from Shapes.KVMarkings import KVMarkings
+from .Dataclasses.Cube import Cube
+from .Dataclasses.KVData import KVData, KVDataEvent
+from .Dataclasses.Marking import Marking
 
 class KVManager:
     __MARKING_PREFIX: str = "marking_"
     def __init__(self, canvas: Canvas) -> None:
-        kv_markings = KVMarkings(canvas)
-        self.__kv_drawer = KVDrawer(canvas, kv_markings)
-        self.__kv_data = KVData(kv_markings)
+        self.__canvas: Canvas = canvas
+        self.__kv_drawer = KVDrawer(canvas)
+        self.__kv_data = KVData()
+        self.__kv_drawer.attach(self.__kv_data)
+        self.__marking_index = MarkingIndex()
+        self.__kv_data.subscribe(self.__marking_index.on_kv_data_changed)
+        self.__kv_data.subscribe(self.__on_markings_changed)
+        #the cell under the mouse (-1 if there is none)
+        self.__hover_index: int = -1
 
         self.__marking_id_generator = IterTools.IDGenerator(map(lambda x: f"{KVManager.__MARKING_PREFIX}{x}", count()))
 
-        self.title = StringVar(value="")
+        self.title = StringVar(canvas, value="")
+        self.__vars_input: CoalescedInput | None = None
+        self.__vals_input: CoalescedInput | None = None
+        #gets every handled event (set it before linking, so the recording can be replayed from the start)
+        self.recorder: SessionRecorder | None = None
 
     def get_kv_string(self) -> str:
+        self.flush_input()
         return get_kv_string(self.__kv_data, self.title.get())
     #region Button Funcs
     def new_marking(self) -> None:
-        if len(self.__kv_data.get_selected_marking().indices) == 0:
+        if self.__kv_data.get_selected_marking().cube is None:
             return #why would someone need a new marking if the current one is empty
+        self.__record("new_marking")
         new_col = self.__color_menu.next_color()
         
         self.__kv_data.add_marking(new_col, self.__marking_id_generator.generate_id(), self.__kv_data.selected + 1)
         self.__kv_data.selected += 1
 
     def different_marking(self, offset: int) -> None:
-        current_marking = self.__kv_data.get_selected_marking()
-        current_indices = current_marking.indices
-        if len(current_indices) == 0 and self.__kv_data.len_markings > 1:
-            self.__clear_marking(current_marking)
-            self.__kv_data.remove_marking(self.__kv_data.selected)
-            self.__color_menu.release_marking_color(current_marking)
-            self.__marking_id_generator.release_id(current_marking.TAG)
+        self.__record("different_marking", offset=offset)
+        if self.__kv_data.get_selected_marking().cube is None and self.__kv_data.len_markings > 1:
+            self.__remove_marking(self.__kv_data.selected)
         else:
             self.__kv_data.selected += offset
 
         self.__color_menu.set_color_from_marking(self.__kv_data.get_selected_marking())
+
+    def select_at(self, index: int) -> None:
+        """selects a marking that covers the cell of index, selecting the same cell again cycles through the markings that overlap there"""
+        covering: list[Marking] = list(self.__marking_index.markings_at(index))
+        if not covering:
+            return
+        self.__record("select_at", index=index)
+        selected = self.__kv_data.get_selected_marking()
+        position: int = next((i + 1 for i, m in enumerate(covering) if m is selected), 0)
+        if selected.cube is None and self.__kv_data.len_markings > 1:
+            #like different_marking an empty marking doesn't stay around when something else gets selected
+            self.__remove_marking(self.__kv_data.selected)
+        self.__kv_data.select_marking(covering[position % len(covering)])
+        self.__color_menu.set_color_from_marking(self.__kv_data.get_selected_marking())
+
+    def markings_at(self, index: int) -> list[Marking]:
+        """the markings that cover the cell of index"""
+        return list(self.__marking_index.markings_at(index))
+
+    def minimize(self) -> None:
+        """replaces all markings with a minimal set of markings for the current values"""
+        self.flush_input()
+        self.__record("minimize")
+        implicants = KVMinimizer.minimize(self.__kv_data.truth_table, self.__kv_data.get_num_vars())
+        while self.__kv_data.len_markings > 1:
+            self.__remove_marking(self.__kv_data.len_markings - 1)
+        with self.__kv_data.batch():
+            marking = self.__kv_data.get_marking(0)
+            if not implicants:
+                self.__kv_data.set_marking_cube(marking, None)
+            for i, implicant in enumerate(implicants):
+                if i:
+                    marking = self.__kv_data.add_marking(self.__color_menu.next_color(), self.__marking_id_generator.generate_id())
+                self.__kv_data.set_marking_cube(marking, KVMinimizer.implicant_to_cube(implicant, self.__kv_data.get_num_vars()))
+            self.__kv_data.selected = self.__kv_data.len_markings - 1
+        self.__color_menu.set_color_from_marking(self.__kv_data.get_selected_marking())
+
+    def import_table(self, path: str) -> None:
+        """replaces the variables and values with the truth table of a PLA or CSV file
+        without names in the file the current variables are kept if their number fits
+
+        :raises ValueError: if the file can't be read as a truth table, has no inputs or more than KVDrawer.MAX_VARS or a name contains ","
+        """
+        names: list[str] | None
+        with open(path, newline="") as f:
+            if path.lower().endswith(".csv"):
+                names, table = PLAHandler.read_csv(f, KVDrawer.MAX_VARS)
+            else:
+                names, table = PLAHandler.read_pla(f, max_inputs=KVDrawer.MAX_VARS)
+        num_vars: int = table.num_cells.bit_length() - 1
+        #the variables entry would read "" as a single variable without a name
+        if num_vars == 0:
+            raise ValueError("the table has no inputs")
+        if names is None:
+            names = self.__kv_data.vars if self.__kv_data.get_num_vars() == num_vars else [f"x_{k}" for k in range(num_vars)]
+        #the variables entry separates the names with ","
+        if invalid := [name for name in names if "," in name]:
+            raise ValueError(f"the variable names {', '.join(map(repr, invalid))} contain ','")
+        assert self.__vars_input is not None and self.__vals_input is not None
+        self.__vars_input.set(",".join(names))
+        self.__vals_input.set(table.to_string())
+
+    def apply_expression(self, text: str) -> None:
+        """fills the values with the truth table of a boolean expression of the variables (see KVExpression)
+
+        :raises ValueError: if the expression is invalid or uses an unknown variable
+        """
+        self.flush_input()
+        table = Expression(text).evaluate(self.__kv_data.vars)
+        assert self.__vals_input is not None
+        self.__vals_input.set(table.to_string())
+
+    def export_table(self, path: str) -> None:
+        """writes the markings as PLA or, for a .csv path, the values as CSV truth table"""
+        self.flush_input()
+        with open(path, "w", newline="") as f:
+            if path.lower().endswith(".csv"):
+                PLAHandler.write_csv(f, self.__kv_data.vars, self.__kv_data.truth_table, self.title.get())
+            else:
+                PLAHandler.write_pla(f, self.__kv_data, self.title.get())
     #endregion
     #
     #
     #
     #region Events
+    @traced("KVManager.on_resize")
     def on_resize(self, event: Event) -> None:
+        self.__record("resize", width=self.__canvas.winfo_width(), height=self.__canvas.winfo_height())
         self.__kv_drawer.schedule_resize(self.__kv_data)
 
+    def finish_resize(self) -> None:
+        """runs the relayout of a resize right away instead of waiting for the canvas to settle"""
+        self.__kv_drawer.finish_resize(self.__kv_data)
+
+    @traced("KVManager.on_left_click")
     def on_left_click(self, event: Event) -> None:
-        if (index := self.__event_to_kv_index(event)) == -1:
-            return
-        current_indices = self.__kv_data.get_selected_marking().indices
-        if len(current_indices) == 0:
-            current_indices.append(index)
-        elif (different_bit := KVUtils.get_different_bit(index, current_indices)) is not None:    
-            KVUtils.expand_block(current_indices, different_bit)
-        else:
+        self.left_click(self.__event_to_kv_index(event))
+
+    def left_click(self, index: int) -> None:
+        """adds the cell of index to the selected marking (if it fits, -1 does nothing)"""
+        if index == -1:
             return
-        self.__update_selected_marking()
+        self.__record("left_click", index=index)
+        current_marking = self.__kv_data.get_selected_marking()
+        if current_marking.cube is None:
+            self.__kv_data.set_marking_cube(current_marking, Cube(0, index))
+        elif (different_bit := KVUtils.get_different_bit(index, current_marking.cube)) is not None:    
+            self.__kv_data.set_marking_cube(current_marking, KVUtils.expand_block(current_marking.cube, different_bit))
     
+    @traced("KVManager.on_select_click")
+    def on_select_click(self, event: Event) -> None:
+        self.select_at(self.__event_to_kv_index(event))
+
+    def on_motion(self, event: Event) -> None:
+        self.hover(self.__event_to_kv_index(event))
+
+    def on_leave(self, event: Event) -> None:
+        self.hover(-1)
+
+    def hover(self, index: int) -> None:
+        """highlights the markings that cover the cell of index (-1 highlights none)"""
+        if index == self.__hover_index:
+            return
+        self.__hover_index = index
+        self.__kv_drawer.highlight_markings(self.__marking_index.tags_at(index))
+
+    @traced("KVManager.on_right_click")
     def on_right_click(self, event: Event) -> None:
+        self.right_click(self.__event_to_kv_index(event))
+
+    def right_click(self, index: int) -> None:
+        """removes the half with the cell of index from the selected marking, a single cell gets removed on any click"""
+        self.__record("right_click", index=index)
         current_marking = self.__kv_data.get_selected_marking()
-        current_indices = current_marking.indices
-        if len(current_indices) == 0:
+        current_cube = current_marking.cube
+        if current_cube is None:
             return
-        elif len(current_indices) == 1:
-            self.__clear_marking(current_marking)
-        elif (index := self.__event_to_kv_index(event)) in current_indices:
-            KVUtils.shrink_block(current_indices, index)
-            self.__update_selected_marking()
+        elif len(current_cube) == 1:
+            self.__kv_data.set_marking_cube(current_marking, None)
+        elif index in current_cube:
+            self.__kv_data.set_marking_cube(current_marking, KVUtils.shrink_block(current_cube, index, current_marking.expansion_order[-1]))
     
     def on_colors_changed(self, event: Event) -> None:
         self.__kv_data.update_colors()
@@ -90,61 +215,60 @@ class KVManager:
     #
     #region linker methods 
     def link_vals(self, vals: StringVar) -> None:
-        def vals_changed() -> None:
-            new_values = vals.get()
-            self.__kv_data.vals = new_values
-            self.__kv_drawer.update(self.__kv_data, new_values=new_values)
-        vals.trace_add('write', lambda name, index, mode: vals_changed())
-        vals_changed()
+        @traced("KVManager.link_vals")
+        def vals_changed(new_values: str) -> None:
+            self.__record("vals", value=new_values)
+            self.__kv_data.set_vals(new_values)
+        #the values only change the texts of the cells in place, only running past the cells of the diagram waits until the typing stops
+        self.__vals_input = CoalescedInput(self.__canvas, vals, vals_changed, structure=lambda text: len(text) > 2**self.__kv_data.get_num_vars())
+        self.__vals_input.flush()
     
     def link_vars(self, vars: StringVar) -> None:
-        def vars_changed() -> None:
-            new_vars = vars.get().split(",")
-            if len(self.__kv_data.vars) != len(new_vars):    
-                grid_mode: GridUpdateMode = GridUpdateMode.UPDATE
-            else:
-                grid_mode: GridUpdateMode = GridUpdateMode.NONE
-            self.__kv_data.vars = new_vars
-            self.__update_kv_width()
-            self.__kv_drawer.update(self.__kv_data, new_vars=new_vars, draw_grid=grid_mode)
-        vars.trace_add('write', lambda name, index, mode: vars_changed())
-        vars_changed()
+        @traced("KVManager.link_vars")
+        def vars_changed(new_vars: str) -> None:
+            self.__record("vars", value=new_vars)
+            self.__kv_data.set_vars(new_vars.split(","))
+        #a different number of variables rebuilds the grid, that waits until the typing stops
+        self.__vars_input = CoalescedInput(self.__canvas, vars, vars_changed, structure=lambda text: text.count(","))
+        self.__vars_input.flush()
+
+    def flush_input(self) -> None:
+        """applies the edits of the variables and values that are still waiting"""
+        [input.flush() for input in (self.__vars_input, self.__vals_input) if input is not None]
     
     def link_marking_color(self, color_menu: KVColorsMenu) -> None:
         color_menu.trace_color(self.__color_changed)
         self.__color_menu: KVColorsMenu = color_menu
+        self.__record("link_colors", color=color_menu.get_color())
         self.__kv_data.add_marking(color_menu.get_color(), self.__marking_id_generator.generate_id())
         self.__kv_data.selected = 0
     
     def __color_changed(self, new_color: str):
         if self.__kv_data.len_markings:
             marking = self.__kv_data.get_selected_marking()
-            marking.latex_color = new_color
-            self.__kv_drawer.set_marking_color(marking.TAG, marking.tkinter_color)
+            if new_color != marking.latex_color:
+                self.__record("color", color=new_color)
+            self.__kv_data.set_marking_color(marking, new_color)
     #endregion
     #
     #
     #
     #region Internal Utils
-    def __event_to_kv_index(self, event: Event):
-        x,y = self.__kv_drawer.canvas_to_grid_coord(event.x, event.y)
-        if x < 0 or x >= self.__kv_data.width or y < 0 or y >= self.__kv_data.height:
-            return -1
-        return KVUtils.CoordinateToIndex(x,y)
-    
-    def __update_kv_width(self) -> None:
-        num_left_vars = self.__kv_data.get_num_vars() // 2
-        num_top_vars = self.__kv_data.get_num_vars() - num_left_vars
+    def __record(self, event: str, **data: Any) -> None:
+        if self.recorder is not None:
+            self.recorder.record(event, **data)
 
-        self.__kv_data.width = 2**num_top_vars
-        self.__kv_data.height = 2**num_left_vars
-    
-    def __clear_marking(self, marking: Marking):
-        marking.indices.clear()
-        self.__kv_drawer.delete_marking(marking.TAG)
+    def __on_markings_changed(self, event: KVDataEvent, marking: Marking | None) -> None:
+        """keeps the highlight of the cell under the mouse up to date while the markings change below it"""
+        if self.__hover_index != -1 and event in (KVDataEvent.MARKING_ADDED, KVDataEvent.MARKING_CHANGED, KVDataEvent.MARKING_REMOVED):
+            self.__kv_drawer.highlight_markings(self.__marking_index.tags_at(self.__hover_index))
+
+    def __event_to_kv_index(self, event: Event):
+        return self.__kv_drawer.canvas_to_kv_index(event.x, event.y)
     
-    def __update_selected_marking(self):
-        marking = self.__kv_data.get_selected_marking()
-        marking.drawables = MarkingData.from_indices(marking.indices, self.__kv_data.width, self.__kv_data.height)
-        self.__kv_drawer.update(self.__kv_data, changed_markings=[marking])
+    def __remove_marking(self, index: int) -> None:
+        marking = self.__kv_data.get_marking(index)
+        self.__kv_data.remove_marking(index)
+        self.__color_menu.release_marking_color(marking)
+        self.__marking_id_generator.release_id(marking.TAG)
     #endregion
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""exact minimization of a KV diagram into a minimal set of markings
+
+the prime implicants are generated with Quine-McCluskey and the final choice is made with a bounded exact cover search (Petrick's method as branch and bound)
+implicants are bitsets (mask, value): mask has the bits of the variables that are part of the implicant (the fixed bits of the marking),
+value has their values and is 0 on every bit that is not in mask"""
+from collections.abc import Iterator
+from heapq import heapify, heappop, heappush
+
+from .Dataclasses.Cube import Cube
+from .Dataclasses.TruthTable import TruthTable
+
+Implicant = tuple[int, int]
+
+def minimize(vals: TruthTable | str, num_vars: int, max_nodes: int = 5_000) -> list[Implicant]:
+    """returns a minimal list of implicants that cover all "1" of vals, "*" can be covered but doesn't need to be
+    minimal means the fewest implicants and out of those the fewest literals
+    the result is exact if the cover search needs less than max_nodes nodes, otherwise it is the best cover found until then
+
+    :param vals: the values of the KV diagram by index (missing values count as 0), e.g. KVData.truth_table
+    :type vals: TruthTable | str
+    :param num_vars: the number of variables of the KV diagram
+    :type num_vars: int
+    :param max_nodes: the maximum number of nodes the exact cover search visits
+    :type max_nodes: int = 5_000
+    :return: the chosen implicants
+    :rtype: list[Implicant]
+    """
+    table: TruthTable = TruthTable.from_string(vals, 2**num_vars) if isinstance(vals, str) else vals.resized(2**num_vars)
+    if not table.on:
+        return []
+    ones: list[int] = list(TruthTable.indices(table.on))
+    dont_cares: list[int] = list(TruthTable.indices(table.dc))
+    return select_cover(get_prime_implicants(num_vars, ones, dont_cares), ones, num_vars, max_nodes)
+
+def get_prime_implicants(num_vars: int, ones: list[int], dont_cares: list[int]) -> list[Implicant]:
+    """Quine-McCluskey: merges implicants of the same mask that differ in a single bit until nothing can be merged anymore"""
+    primes: list[Implicant] = []
+    current: dict[int, set[int]] = {(1 << num_vars) - 1: set(ones) | set(dont_cares)}
+    while current:
+        merged_level: dict[int, set[int]] = {}
+        for mask, values in current.items():
+            bits = list(_single_bits(mask))
+            merged: set[int] = set()
+            for value in values:
+                for bit in bits:
+                    if not value & bit and value | bit in values:
+                        merged_level.setdefault(mask & ~bit, set()).add(value)
+                        merged.add(value)
+                        merged.add(value | bit)
+            primes.extend((mask, value) for value in values - merged)
+        current = merged_level
+    return primes
+
+def select_cover(primes: list[Implicant], ones: list[int], num_vars: int, max_nodes: int = 5_000) -> list[Implicant]:
+    """chooses the cheapest subset of primes that covers all ones
+    every prime gets a bitset of the ones it covers, the table gets reduced with essential primes and dominance
+    and the remaining cyclic core is decided with a depth first branch and bound"""
+    positions: dict[int, int] = {one: pos for pos, one in enumerate(ones)}
+    full_mask: int = (1 << num_vars) - 1
+    covers: list[int] = []
+    candidates: list[Implicant] = []
+    for mask, value in primes:
+        cover = _or_all(1 << positions[cell] for cell in _cells(value, ~mask & full_mask) if cell in positions)
+        if cover:
+            covers.append(cover)
+            candidates.append((mask, value))
+    costs: list[int] = [mask.bit_count() for mask, _ in candidates]
+
+    chosen, active, uncovered = _reduce(covers, costs, (1 << len(ones)) - 1)
+    covered_by: dict[int, list[int]] = {pos: [c for c in active if covers[c] >> pos & 1] for pos in _set_bit_positions(uncovered)}
+    #ones with few primes first, they are the best to branch on and to build the lower bound from
+    order: list[int] = sorted(covered_by, key=lambda p: len(covered_by[p]))
+    blocks: dict[int, int] = {pos: _or_all(covers[c] for c in covering) for pos, covering in covered_by.items()}
+
+    best: list[int] = chosen + _greedy_cover(uncovered, covers, active)
+    best_cost: tuple[int, int] = (len(best), sum(costs[c] for c in best))
+    nodes: int = 0
+
+    def lower_bound(uncovered: int) -> int:
+        # ones that share no prime need different primes
+        bound: int = 0
+        blocked: int = 0
+        for pos in order:
+            if uncovered >> pos & 1 and not blocked >> pos & 1:
+                bound += 1
+                blocked |= blocks[pos]
+        return bound
+
+    def search(uncovered: int, selection: list[int], literals: int) -> None:
+        nonlocal best, best_cost, nodes
+        nodes += 1
+        if not uncovered:
+            if (len(selection), literals) < best_cost:
+                best, best_cost = selection.copy(), (len(selection), literals)
+            return
+        if nodes >= max_nodes or len(selection) + lower_bound(uncovered) > best_cost[0]:
+            return
+        pos = next(p for p in order if uncovered >> p & 1)
+        for candidate in sorted(covered_by[pos], key=lambda c: -(covers[c] & uncovered).bit_count()):
+            selection.append(candidate)
+            search(uncovered & ~covers[candidate], selection, literals + costs[candidate])
+            selection.pop()
+
+    search(uncovered, chosen, sum(costs[c] for c in chosen))
+    return [candidates[c] for c in best]
+
+def _reduce(covers: list[int], costs: list[int], uncovered: int) -> tuple[list[int], list[int], int]:
+    """takes essential primes and removes dominated primes (rows) and dominating ones (columns) until nothing changes
+    returns the chosen primes, the primes that are still in question and the ones that still need to be covered"""
+    chosen: list[int] = []
+    active: list[int] = list(range(len(covers)))
+    changed: bool = True
+    while changed and uncovered:
+        changed = False
+        covered_by: dict[int, int] = {}
+        for c in active:
+            for pos in _set_bit_positions(covers[c] & uncovered):
+                covered_by[pos] = covered_by.get(pos, 0) | 1 << c
+        for pos, covering in covered_by.items():
+            if covering.bit_count() == 1 and uncovered >> pos & 1:
+                essential = covering.bit_length() - 1
+                chosen.append(essential)
+                uncovered &= ~covers[essential]
+                changed = True
+        if changed:
+            active = [c for c in active if covers[c] & uncovered]
+            continue
+        #a one that is covered by a superset of the primes of another one gets covered anyway
+        for pos, covering in covered_by.items():
+            if uncovered >> pos & 1:
+                #only the ones of any of its primes can be covered by all of them
+                for other in _set_bit_positions(covers[covering.bit_length() - 1] & uncovered & ~(1 << pos)):
+                    if covering & ~covered_by[other] == 0:
+                        uncovered &= ~(1 << other)
+                        changed = True
+        #a prime that covers a subset of a cheaper (or equal) prime is never needed
+        remaining: list[int] = []
+        for c in active:
+            cover = covers[c] & uncovered
+            #only the primes of one of its ones can dominate a prime
+            rivals = covered_by[next(_set_bit_positions(cover))] if cover else 0
+            if not cover or any(_dominates(covers[o] & uncovered, costs[o], o, cover, costs[c], c) for o in _set_bit_positions(rivals)):
+                changed = True
+            else:
+                remaining.append(c)
+        active = remaining
+    return chosen, active, uncovered
+
+def _dominates(cover: int, cost: int, index: int, other_cover: int, other_cost: int, other_index: int) -> bool:
+    if index == other_index or other_cover & ~cover:
+        return False
+    if cost != other_cost:
+        return cost < other_cost
+    return cover != other_cover or index < other_index
+
+def implicant_to_cube(implicant: Implicant, num_vars: int) -> Cube:
+    mask, value = implicant
+    return Cube(~mask & ((1 << num_vars) - 1), value)
+
+def _cells(value: int, free_mask: int) -> list[int]:
+    cells: list[int] = [value]
+    for bit in _single_bits(free_mask):
+        cells.extend([i | bit for i in cells])
+    return cells
+
+def _greedy_cover(uncovered: int, covers: list[int], candidates: list[int]) -> list[int]:
+    """takes the prime that covers the most uncovered ones until everything is covered
+    gains only shrink, so an outdated gain in the heap is an upper bound and only the top needs to be recalculated"""
+    ret: list[int] = []
+    heap: list[tuple[int, int]] = [(-(covers[c] & uncovered).bit_count(), c) for c in candidates]
+    heapify(heap)
+    while uncovered:
+        _, candidate = heappop(heap)
+        gain = (covers[candidate] & uncovered).bit_count()
+        if heap and gain < -heap[0][0]:
+            heappush(heap, (-gain, candidate))
+            continue
+        ret.append(candidate)
+        uncovered &= ~covers[candidate]
+    return ret
+
+def _or_all(values: Iterator[int]) -> int:
+    ret: int = 0
+    for value in values:
+        ret |= value
+    return ret
+
+def _single_bits(value: int) -> Iterator[int]:
+    while value:
+        bit = value & -value
+        yield bit
+        value ^= bit
+
+def _set_bit_positions(value: int) -> Iterator[int]:
+    return (bit.bit_length() - 1 for bit in _single_bits(value))
@@ -1,36 +1,36 @@
+from __future__ import annotations
 from collections import deque
-from collections.abc import Iterator
-from functools import partial
-from typing import Optional
-from IterTools import take_n
+from functools import cache
+from typing import TYPE_CHECKING, Optional
 
+from .Dataclasses.Cube import Cube
 
-def is_kv_neighbour(v1: int, v2: int) -> bool:
-    return (v1 ^ v2).bit_count() == 1
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+    import numpy as np
 
 
-def find_kv_neigbours(val: int, others: list[int]) -> Iterator[int]:
-    return filter(partial(is_kv_neighbour, v2=val), others)
+def get_kv_dimensions(num_vars: int) -> tuple[int, int]:
+    """returns the (width, height) in cells of a KV diagram with num_vars variables
+    the variables alternate between the top and the left side, starting at the top"""
+    num_left_vars = num_vars // 2
+    num_top_vars = num_vars - num_left_vars
+    return 2**num_top_vars, 2**num_left_vars
 
-def find_different_bits(v1: int, v2: int) -> Iterator[int]:
-    differences = v1 ^ v2
-    index = 0
-    while differences:
-        if differences & 1:
-            yield index
-        index += 1
-        differences >>= 1
-
-def get_different_bit(index: int, others: list[int]) -> Optional[int]:
-    if len(neighbourlist := take_n(find_kv_neigbours(index, others), 1)) == 0:
+def get_different_bit(index: int, cube: Cube) -> Optional[int]:
+    """returns the bit in which index differs from the cube, if the cube and its mirror along that bit would contain index
+    (None if index is part of the cube or differs in more than one bit)"""
+    difference: int = (index & ~cube.free_mask) ^ cube.value
+    if difference.bit_count() != 1:
         return None
-    ret: int = index ^ neighbourlist[0]
-    assert(ret.bit_count() == 1)
-    return ret.bit_length() - 1
+    return difference.bit_length() - 1
 
 def make_blocks(indices: list[int]) -> list[list[tuple[int, int]]]:
     #modified Flood Fill Algorithm
-    coords: set[tuple[int, int]] = {IndexToCoordinate(i) for i in indices}
+    if not indices:
+        return []
+    coordinate_table = index_to_coordinate_table(max(indices).bit_length())
+    coords: set[tuple[int, int]] = {coordinate_table[i] for i in indices}
     islands: list[list[tuple[int, int]]] = []
     while coords:
         item: tuple[int, int] = coords.pop()
@@ -47,23 +47,15 @@ def make_blocks(indices: list[int]) -> list[list[tuple[int, int]]]:
         islands.append(island)
     return islands
 
-def expand_block(indices: list[int], bit: int) -> None:
-    indices.extend([i ^ (1 << bit) for i in indices])
-
-def shrink_block(indices: list[int], index: int) -> None:
-    def compare_bit(v1: int, v2: int, bit_offset: int) -> bool:
-        return bool(1 & ((v1 ^ v2) >> bit_offset)) 
-    mid = len(indices) // 2
-    relative_index: int
-    index_in_current: int = indices.index(index)
-    if index_in_current < mid:
-        relative_index = next(find_kv_neigbours(index, indices[mid:]))
-    else:
-        relative_index = next(find_kv_neigbours(index, indices[:mid]))
-    change = next(find_different_bits(index, relative_index))
+def expand_block(cube: Cube, bit: int) -> Cube:
+    """doubles the cube along bit"""
+    return Cube(cube.free_mask | (1 << bit), cube.value & ~(1 << bit))
 
-    indices[:mid] = list(filter(lambda x: not compare_bit(x, relative_index, change), indices))
-    indices[mid:] = []
+def shrink_block(cube: Cube, index: int, bit: int) -> Cube:
+    """halves the cube along bit and keeps the half that doesn't contain index
+    (the cube needs to contain index and bit needs to be one of its free bits, e.g. the last one of Marking.expansion_order)"""
+    mask: int = 1 << bit
+    return Cube(cube.free_mask & ~mask, cube.value | (~index & mask))
 
 def get_rect_bounds_from_block(block: list[int]) -> tuple[tuple[int, int], tuple[int, int]]:
         coords = [IndexToCoordinate(i) for i in block]
@@ -125,4 +117,72 @@ def IndexToCoordinate(index: int) -> tuple[int, int]:
     x = inv_gray_code(gray_x)
     y = inv_gray_code(gray_y) 
 
-    return x, y
\ No newline at end of file
+    return x, y
+
+def vars_for_cells(num_cells: int) -> int:
+    """the number of variables needed for a KV diagram with num_cells cells"""
+    return max(num_cells - 1, 0).bit_length()
+
+#region lookup tables
+# The *_array functions are the only users of numpy, an optional dependency (see README), it is imported inside of them
+# so KVUtils can be imported without it.
+# The mapping between indices and coordinates doesn't depend on the number of variables,
+# so the table of n variables is also valid for every smaller index of a bigger diagram.
+@cache
+def index_to_coordinate_table(num_vars: int) -> tuple[tuple[int, int], ...]:
+    """IndexToCoordinate of every index of a KV diagram with num_vars variables (table[index] = (x, y))
+    the table gets built once per number of variables"""
+    return tuple(IndexToCoordinate(i) for i in range(2**num_vars))
+
+@cache
+def coordinate_to_index_table(num_vars: int) -> tuple[tuple[int, ...], ...]:
+    """CoordinateToIndex of every cell of a KV diagram with num_vars variables (table[y][x] = index)
+    the table gets built once per number of variables"""
+    width, height = get_kv_dimensions(num_vars)
+    rows: list[list[int]] = [[0] * width for _ in range(height)]
+    for index, (x, y) in enumerate(index_to_coordinate_table(num_vars)):
+        rows[y][x] = index
+    return tuple(tuple(row) for row in rows)
+
+@cache
+def index_to_coordinate_array(num_vars: int) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+    """the batch version of IndexToCoordinate, returns the arrays (xs, ys) with xs[index], ys[index] being the coordinate of index
+    the arrays are cached and therefore read only
+
+    :raises ModuleNotFoundError: if numpy isn't installed
+    """
+    import numpy as np
+    indices = np.arange(2**num_vars, dtype=np.intp)
+    gray_x = np.zeros_like(indices)
+    gray_y = np.zeros_like(indices)
+    for bit in range(num_vars):
+        target = gray_y if bit & 1 else gray_x
+        target |= ((indices >> bit) & 1) << (bit >> 1)
+    xs, ys = _inv_gray_code_array(gray_x), _inv_gray_code_array(gray_y)
+    xs.setflags(write=False)
+    ys.setflags(write=False)
+    return xs, ys
+
+@cache
+def coordinate_to_index_array(num_vars: int) -> NDArray[np.intp]:
+    """the batch version of CoordinateToIndex, returns an array of shape (height, width) with array[y, x] being the index of (x, y)
+    the array is cached and therefore read only
+
+    :raises ModuleNotFoundError: if numpy isn't installed
+    """
+    import numpy as np
+    width, height = get_kv_dimensions(num_vars)
+    xs, ys = index_to_coordinate_array(num_vars)
+    table = np.empty((height, width), dtype=np.intp)
+    table[ys, xs] = np.arange(2**num_vars, dtype=np.intp)
+    table.setflags(write=False)
+    return table
+
+def _inv_gray_code_array(values: NDArray[np.intp]) -> NDArray[np.intp]:
+    ret = values.copy()
+    shifted = values >> 1
+    while shifted.any():
+        ret ^= shifted
+        shifted >>= 1
+    return ret
+#endregion
\ No newline at end of file
@@ -0,0 +1,68 @@
+from collections.abc import Collection, Iterable
+
+from .Dataclasses.Cube import Cube
+from .Dataclasses.KVData import KVDataEvent
+from .Dataclasses.Marking import Marking
+
+class MarkingIndex:
+    """which markings cover a cell, kept up to date with the events of KVData (subscribe on_kv_data_changed)
+    a changed marking only touches the cells it gained or lost (an expansion or a shrink is a single half of the cube),
+    so a lookup is a single dict access no matter how many markings there are"""
+    def __init__(self) -> None:
+        #per cell index the markings that cover it by TAG, in the order they started covering it
+        self.__cells: dict[int, dict[str, Marking]] = {}
+        #the cube every marking is indexed with
+        self.__marking_cubes: dict[str, Cube] = {}
+
+    def on_kv_data_changed(self, event: KVDataEvent, marking: Marking | None) -> None:
+        if marking is None:
+            return
+        match event:
+            case KVDataEvent.MARKING_ADDED | KVDataEvent.MARKING_CHANGED:
+                self.__set_cube(marking, marking.cube)
+            case KVDataEvent.MARKING_REMOVED:
+                self.__set_cube(marking, None)
+            case _:
+                pass
+
+    def markings_at(self, index: int) -> Collection[Marking]:
+        """the markings that cover the cell of index"""
+        covering = self.__cells.get(index)
+        return () if covering is None else covering.values()
+
+    def tags_at(self, index: int) -> Collection[str]:
+        """the TAGs of the markings that cover the cell of index"""
+        covering = self.__cells.get(index)
+        return () if covering is None else covering.keys()
+
+    def __set_cube(self, marking: Marking, cube: Cube | None) -> None:
+        old_cube: Cube | None = self.__marking_cubes.pop(marking.TAG, None)
+        for index in MarkingIndex.__difference(old_cube, cube):
+            covering = self.__cells[index]
+            del covering[marking.TAG]
+            if not covering:
+                del self.__cells[index]
+        for index in MarkingIndex.__difference(cube, old_cube):
+            self.__cells.setdefault(index, {})[marking.TAG] = marking
+        if cube is not None:
+            self.__marking_cubes[marking.TAG] = cube
+
+    @staticmethod
+    def __difference(cube: Cube | None, other: Cube | None) -> Iterable[int]:
+        """the cells of cube that aren't part of other"""
+        if cube is None:
+            return ()
+        if other is None:
+            return cube.indices()
+        if MarkingIndex.__is_part(cube, other):
+            return ()
+        extra: int = cube.free_mask & ~other.free_mask
+        if extra.bit_count() == 1 and MarkingIndex.__is_part(other, cube):
+            #other is one half of cube, the rest is the other half
+            return Cube(other.free_mask, other.value ^ extra).indices()
+        return [index for index in cube.indices() if index not in other]
+
+    @staticmethod
+    def __is_part(cube: Cube, other: Cube) -> bool:
+        """whether every cell of cube is a cell of other"""
+        return cube.free_mask & ~other.free_mask == 0 and cube.value & ~other.free_mask == other.value
@@ -0,0 +1,199 @@
+"""headless micro benchmarks of the KV core
+
+usage (from src): python -m Profiling.Benchmark -o bench.json
+                  python -m Profiling.Benchmark --compare bench.json
+every benchmark runs for 2 to 16 variables (--vars), the ones that depend on markings also for a growing number of markings.
+the results are written as json, with --compare every result that got slower than the baseline by more than --threshold is reported
+and the exit code is 1"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from DataStructures.CompleteListBinTree import CompleteListBinTree
+from Globals import DYNAMIC
+from KV_Diagramm import KVUtils
+from KV_Diagramm.KVToLaTeX import get_kv_string
+from KV_Diagramm.Dataclasses.Cube import Cube
+from KV_Diagramm.Dataclasses.KVData import KVData
+from KV_Diagramm.Dataclasses.Marking import MarkingData
+from KV_Diagramm.Dataclasses.TruthTable import TruthTable
+
+#a benchmark gets the number of variables and markings and returns the function to time (None if the case doesn't apply)
+Benchmark = Callable[[int, int, random.Random], Callable[[], object] | None]
+Result = dict[str, Any]
+
+MARKING_COUNTS: tuple[int, ...] = (1, 8, 64)
+
+def random_cube(num_vars: int, rng: random.Random) -> Cube:
+    """a cube in which every variable is free with a chance of 1/2"""
+    free_mask: int = rng.getrandbits(num_vars) if num_vars else 0
+    return Cube(free_mask, rng.getrandbits(num_vars) & ~free_mask if num_vars else 0)
+
+def random_kv_data(num_vars: int, num_markings: int, rng: random.Random) -> KVData:
+    vars = [f"x_{i}" for i in range(num_vars)]
+    kv_data = KVData(vals="".join(rng.choice("01*") for _ in range(2**num_vars)))
+    kv_data.set_vars(vars)
+    colors = list(DYNAMIC.Colors)
+    for i in range(num_markings):
+        kv_data.set_marking_cube(kv_data.add_marking(colors[i % len(colors)], f"marking_{i}"), random_cube(num_vars, rng))
+    return kv_data
+
+#region benchmarks
+def bench_coordinate_to_index(num_vars: int, num_markings: int, rng: random.Random) -> Callable[[], object] | None:
+    width, height = KVUtils.get_kv_dimensions(num_vars)
+    coordinates = [(x, y) for y in range(height) for x in range(width)]
+    return lambda: [KVUtils.CoordinateToIndex(x, y) for x, y in coordinates]
+
+def bench_index_to_coordinate(num_vars: int, num_markings: int, rng: random.Random) -> Callable[[], object] | None:
+    indices = range(2**num_vars)
+    return lambda: [KVUtils.IndexToCoordinate(i) for i in indices]
+
+def bench_make_blocks(num_vars: int, num_markings: int, rng: random.Random) -> Callable[[], object] | None:
+    indices = random_cube(num_vars, rng).indices()
+    return lambda: KVUtils.make_blocks(indices)
+
+def bench_expand_shrink_block(num_vars: int, num_markings: int, rng: random.Random) -> Callable[[], object] | None:
+    """grows a single cell to the whole diagram bit by bit and shrinks it back"""
+    def run() -> Cube:
+        cube = Cube(0, 0)
+        for bit in range(num_vars):
+            cube = KVUtils.expand_block(cube, bit)
+        for bit in reversed(range(num_vars)):
+            cube = KVUtils.shrink_block(cube, 0, bit)
+        return cube
+    return run
+
+def bench_from_indices(num_vars: int, num_markings: int, rng: random.Random) -> Callable[[], object] | None:
+    width, height = KVUtils.get_kv_dimensions(num_vars)
+    cubes = [random_cube(num_vars, rng).indices() for _ in range(num_markings)]
+    return lambda: [MarkingData.from_indices(indices, width, height) for indices in cubes]
+
+def bench_get_tree_layers(num_vars: int, num_markings: int, rng: random.Random) -> Callable[[], object] | None:
+    """the tree of the top variables, the way KVVarIDs builds it"""
+    tree: CompleteListBinTree[int] = CompleteListBinTree(lambda height: height)
+    height = num_vars - num_vars // 2 - 1
+    if height <= 0:
+        return None
+    tree.resize(height)
+    return lambda: list(tree.get_tree_layers())
+
+def bench_get_tree_layer(num_vars: int, num_markings: int, rng: random.Random) -> Callable[[], object] | None:
+    tree: CompleteListBinTree[int] = CompleteListBinTree(lambda height: height)
+    height = num_vars - num_vars // 2 - 1
+    if height <= 0:
+        return None
+    tree.resize(height)
+    return lambda: [list(tree.get_tree_layer(layer)) for layer in range(height)]
+
+def bench_truth_table(num_vars: int, num_markings: int, rng: random.Random) -> Callable[[], object] | None:
+    """the values string to bitsets and back"""
+    vals = "".join(rng.choice("01*") for _ in range(2**num_vars))
+    return lambda: TruthTable.from_string(vals).to_string()
+
+def bench_get_kv_string(num_vars: int, num_markings: int, rng: random.Random) -> Callable[[], object] | None:
+    kv_data = random_kv_data(num_vars, num_markings, rng)
+    return lambda: get_kv_string(kv_data, "f")
+#endregion
+
+#name: (benchmark, depends on the number of markings)
+BENCHMARKS: dict[str, tuple[Benchmark, bool]] = {
+    "CoordinateToIndex": (bench_coordinate_to_index, False),
+    "IndexToCoordinate": (bench_index_to_coordinate, False),
+    "make_blocks": (bench_make_blocks, False),
+    "expand_shrink_block": (bench_expand_shrink_block, False),
+    "MarkingData.from_indices": (bench_from_indices, True),
+    "CompleteListBinTree.get_tree_layers": (bench_get_tree_layers, False),
+    "CompleteListBinTree.get_tree_layer": (bench_get_tree_layer, False),
+    "TruthTable": (bench_truth_table, False),
+    "get_kv_string": (bench_get_kv_string, True),
+}
+
+def time_function(func: Callable[[], object], repeat: int, min_time: float) -> tuple[float, int]:
+    """returns the best time of a single call out of repeat runs and the number of calls per run
+    the number of calls per run doubles until a run takes at least min_time seconds"""
+    loops: int = 1
+    while True:
+        elapsed = _time_loops(func, loops)
+        if elapsed >= min_time:
+            break
+        loops *= 2
+    best: float = elapsed
+    for _ in range(repeat - 1):
+        best = min(best, _time_loops(func, loops))
+    return best / loops, loops
+
+def _time_loops(func: Callable[[], object], loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - start
+
+def run_benchmarks(names: list[str], num_vars_range: range, repeat: int = 3, min_time: float = 0.05, seed: int = 0) -> Iterator[Result]:
+    for name in names:
+        benchmark, uses_markings = BENCHMARKS[name]
+        for num_vars in num_vars_range:
+            for num_markings in MARKING_COUNTS if uses_markings else (0,):
+                func = benchmark(num_vars, num_markings, random.Random(seed))
+                if func is None:
+                    continue
+                seconds, loops = time_function(func, repeat, min_time)
+                yield {"name": name, "vars": num_vars, "markings": num_markings, "seconds": seconds, "loops": loops}
+
+def compare(results: list[Result], baseline: list[Result], threshold: float) -> list[str]:
+    """returns a line for every result that is slower than its baseline by more than threshold (0.1 = 10%)"""
+    def key(result: Result) -> tuple[str, int, int]:
+        return result["name"], result["vars"], result["markings"]
+    baseline_times: dict[tuple[str, int, int], float] = {key(r): r["seconds"] for r in baseline}
+    regressions: list[str] = []
+    for result in results:
+        old = baseline_times.get(key(result))
+        if old is None or old <= 0:
+            continue
+        ratio: float = result["seconds"] / old
+        if ratio > 1 + threshold:
+            regressions.append(f"{result['name']} vars={result['vars']} markings={result['markings']}: {old * 1e6:.1f}us -> {result['seconds'] * 1e6:.1f}us ({ratio:.2f}x)")
+    return regressions
+
+def parse_vars(text: str) -> range:
+    """"4" or "2-16" """
+    low, _, high = text.partition("-")
+    return range(int(low), int(high or low) + 1)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="times the hot paths of the KV core")
+    parser.add_argument("-o", "--out", help="file the results get written to as json (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="json file of an earlier run, slower results get reported")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown that counts as a regression (default 0.1)")
+    parser.add_argument("--vars", type=parse_vars, default=range(2, 17), help="number of variables, e.g. 4 or 2-16 (default 2-16)")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, the best one counts")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds of a single run")
+    args = parser.parse_args()
+
+    results: list[Result] = []
+    for result in run_benchmarks(args.only, args.vars, args.repeat, args.min_time):
+        results.append(result)
+        print(f"{result['name']:<40} vars={result['vars']:<3} markings={result['markings']:<3} {result['seconds'] * 1e6:>12.2f}us", file=sys.stderr)
+    report = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
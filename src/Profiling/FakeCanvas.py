@@ -0,0 +1,204 @@
+"""an in-memory tkinter.Canvas that needs no display
+
+FakeCanvas is a real tkinter.Canvas object whose widget command is implemented in Python on top of a plain Tcl interpreter (tkinter.Tcl()),
+so every Canvas method, the batched Tcl scripts of BatchedRender, tkinter.font.Font and StringVar(master=canvas) work unchanged
+and every canvas operation ends up in FakeCanvas.calls.
+this makes it possible to count the canvas operations of an edit without a window, e.g.:
+
+    canvas = FakeCanvas()
+    drawer = KVDrawer(canvas)
+    ...
+    canvas.calls.clear()
+    drawer.update(kv_data, new_values=...)
+    assert canvas.count("coords") <= 1
+
+KVDrawer already counts the round trips into Tcl (frame_round_trips), for single shapes wrap the canvas in a TclCallCounter"""
+from __future__ import annotations
+import tkinter
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any
+
+@dataclass
+class FakeItem:
+    type: str
+    coords: list[float]
+    options: dict[str, str] = field(default_factory=lambda: {})
+    tags: list[str] = field(default_factory=lambda: [])
+
+class FakeCanvas(tkinter.Canvas):
+    __names = count()
+
+    def __init__(self, width: int = 800, height: int = 600) -> None:
+        #Canvas.__init__ is left out on purpose, it would create a real widget
+        self.tk = tkinter.Tcl().tk
+        self._w = f".fake_canvas{next(FakeCanvas.__names)}"
+        self._name = self._w[1:]
+        self.widgetName = "canvas"
+        self.master = None
+        self.children = {}
+        self._tclCommands = None
+        self.width: int = width
+        self.height: int = height
+        self.items: dict[int, FakeItem] = {}
+        #every operation on the canvas as (subcommand, *arguments), including the ones inside batched scripts
+        self.calls: list[tuple[str, ...]] = []
+        self.fonts: dict[str, dict[str, str]] = {}
+        self.__ids = count(1)
+        self.__after_ids = count()
+        self.__pending: dict[str, Callable[[], object]] = {}
+        self.tk.createcommand(self._w, self.__canvas_command)
+        self.tk.createcommand("font", self.__font_command)
+
+    def count(self, subcommand: str) -> int:
+        """the number of recorded calls of a subcommand (e.g. "coords", "itemconfigure", "create")"""
+        return sum(1 for call in self.calls if call[0] == subcommand)
+
+    def operation_counts(self) -> Counter[str]:
+        return Counter(call[0] for call in self.calls)
+
+    def find_items(self, tag_or_id: str | int) -> list[FakeItem]:
+        return [self.items[i] for i in self.__find(str(tag_or_id))]
+
+    #region widget methods without a widget
+    def winfo_width(self) -> int:
+        return self.width
+
+    def winfo_height(self) -> int:
+        return self.height
+
+    def after(self, ms: int | str, func: Callable[..., object] | None = None, *args: Any) -> str:
+        """callbacks don't run on their own, run_pending runs them (they don't need a running mainloop then)"""
+        after_id = f"after#{next(self.__after_ids)}"
+        if func is not None:
+            self.__pending[after_id] = lambda: func(*args)
+        return after_id
+
+    def after_idle(self, func: Callable[..., object], *args: Any) -> str:
+        return self.after("idle", func, *args)
+
+    def after_cancel(self, id: str) -> None:
+        self.__pending.pop(id, None)
+
+    def run_pending(self) -> int:
+        """runs the scheduled callbacks (also the ones they schedule) and returns how many ran"""
+        ran: int = 0
+        while self.__pending:
+            after_id = next(iter(self.__pending))
+            self.__pending.pop(after_id)()
+            ran += 1
+        return ran
+
+    def report_callback_exception(self, exc: type[BaseException], val: BaseException, tb: Any) -> None:
+        #Tk would print the exception and carry on, a test should fail
+        raise val
+    #endregion
+
+    #region Tcl commands
+    def __canvas_command(self, subcommand: str, *args: str) -> str:
+        self.calls.append((subcommand, *args))
+        handler = getattr(self, f"_FakeCanvas__cmd_{subcommand}", None)
+        if handler is None:
+            return ""
+        return handler(*args)
+
+    def __cmd_create(self, type: str, *args: str) -> str:
+        coords: list[str] = []
+        rest = list(args)
+        while rest and not (rest[0].startswith("-") and rest[0][1:2].isalpha()):
+            coords.extend(self.tk.splitlist(rest.pop(0)))
+        item = FakeItem(type, [float(c) for c in coords])
+        self.__configure(item, rest)
+        item_id = next(self.__ids)
+        self.items[item_id] = item
+        return str(item_id)
+
+    def __cmd_coords(self, tag_or_id: str, *coords: str) -> str:
+        ids = self.__find(tag_or_id)
+        if not ids:
+            return ""
+        item = self.items[ids[0]]
+        if coords:
+            item.coords = [float(c) for arg in coords for c in self.tk.splitlist(arg)]
+            return ""
+        return " ".join(map(str, item.coords))
+
+    def __cmd_itemconfigure(self, tag_or_id: str, *options: str) -> str:
+        for item_id in self.__find(tag_or_id):
+            self.__configure(self.items[item_id], list(options))
+        return ""
+
+    def __cmd_itemcget(self, tag_or_id: str, option: str) -> str:
+        ids = self.__find(tag_or_id)
+        if not ids:
+            return ""
+        item = self.items[ids[0]]
+        return " ".join(item.tags) if option == "-tags" else item.options.get(option[1:], "")
+
+    def __cmd_delete(self, *tags_or_ids: str) -> str:
+        for tag_or_id in tags_or_ids:
+            for item_id in self.__find(tag_or_id):
+                del self.items[item_id]
+        return ""
+
+    def __cmd_move(self, tag_or_id: str, x_amount: str, y_amount: str) -> str:
+        dx, dy = float(x_amount), float(y_amount)
+        for item_id in self.__find(tag_or_id):
+            item = self.items[item_id]
+            item.coords = [c + (dy if i & 1 else dx) for i, c in enumerate(item.coords)]
+        return ""
+
+    def __cmd_scale(self, tag_or_id: str, x_origin: str, y_origin: str, x_scale: str, y_scale: str) -> str:
+        origin = (float(x_origin), float(y_origin))
+        scale = (float(x_scale), float(y_scale))
+        for item_id in self.__find(tag_or_id):
+            item = self.items[item_id]
+            item.coords = [origin[i & 1] + (c - origin[i & 1]) * scale[i & 1] for i, c in enumerate(item.coords)]
+        return ""
+
+    def __cmd_find(self, search: str, *args: str) -> str:
+        if search == "all":
+            return " ".join(map(str, self.items))
+        if search == "withtag":
+            return " ".join(map(str, self.__find(args[0])))
+        return ""
+
+    def __cmd_gettags(self, tag_or_id: str) -> str:
+        ids = self.__find(tag_or_id)
+        return self.tk.call("list", *self.items[ids[0]].tags) if ids else ""
+
+    def __cmd_type(self, tag_or_id: str) -> str:
+        ids = self.__find(tag_or_id)
+        return self.items[ids[0]].type if ids else ""
+
+    def __font_command(self, subcommand: str, *args: str) -> str:
+        self.calls.append(("font", subcommand, *args))
+        if subcommand == "create":
+            name, *options = args
+            self.fonts[name] = dict(zip(options[::2], options[1::2]))
+            return name
+        if subcommand in ("configure", "config"):
+            name, *options = args
+            self.fonts.setdefault(name, {}).update(zip(options[::2], options[1::2]))
+        elif subcommand == "delete":
+            [self.fonts.pop(name, None) for name in args]
+        elif subcommand == "names":
+            return " ".join(self.fonts)
+        return ""
+
+    def __configure(self, item: FakeItem, options: list[str]) -> None:
+        for name, value in zip(options[::2], options[1::2]):
+            if name == "-tags":
+                item.tags = list(self.tk.splitlist(value))
+            else:
+                item.options[name[1:]] = value
+
+    def __find(self, tag_or_id: str) -> list[int]:
+        if tag_or_id == "all":
+            return list(self.items)
+        if tag_or_id.isdigit():
+            return [int(tag_or_id)] if int(tag_or_id) in self.items else []
+        return [item_id for item_id, item in self.items.items() if tag_or_id in item.tags]
+    #endregion
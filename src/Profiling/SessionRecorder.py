@@ -0,0 +1,30 @@
+"""recording of the events a KVManager handles, as one json object per line, e.g.:
+{"t": 0.0, "event": "vars", "value": "A,B,C,D"}
+{"t": 1.25, "event": "left_click", "index": 5}
+"t" is the time since the start of the recording in seconds, Profiling.SessionReplay plays a recording back"""
+import json
+import time
+from collections.abc import Iterator
+from typing import Any, TextIO
+
+SessionEvent = dict[str, Any]
+
+class SessionRecorder:
+    def __init__(self, path: str) -> None:
+        self.__file: TextIO = open(path, "w")
+        self.__start: float = time.perf_counter()
+
+    def record(self, event: str, **data: Any) -> None:
+        line = {"t": round(time.perf_counter() - self.__start, 4), "event": event, **data}
+        self.__file.write(json.dumps(line, separators=(",", ":")) + "\n")
+        #a crashed session is the one most worth replaying
+        self.__file.flush()
+
+    def close(self) -> None:
+        self.__file.close()
+
+def read_session(path: str) -> Iterator[SessionEvent]:
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
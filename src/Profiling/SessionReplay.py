@@ -0,0 +1,159 @@
+"""plays a recording of Profiling.SessionRecorder back at full speed and reports the latency of every event
+
+usage (from src): python -m Profiling.SessionReplay session.jsonl [--json latencies.json] [--real]
+without --real the session runs against a FakeCanvas and needs no display,
+with --real it runs against a canvas in a Tk window (resizes then change the size of the window)"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterable
+from tkinter import Canvas, StringVar
+
+from Globals import DYNAMIC
+from IterTools import CyclicCache
+from KV_Diagramm.Dataclasses.Marking import Marking
+from KV_Diagramm.KVManager import KVManager
+
+from .FakeCanvas import FakeCanvas
+from .SessionRecorder import SessionEvent, read_session
+
+class HeadlessColorsMenu:
+    """the color handling of UI.KVColorsMenu.KVColorsMenu without the OptionMenu"""
+    def __init__(self) -> None:
+        self.__colors: CyclicCache[str] = CyclicCache(iter(DYNAMIC.Colors))
+        self.__current_color: str = self.__colors.get_item()
+        self.__callback: Callable[[str], None] = lambda _: None
+
+    def get_color(self) -> str:
+        return self.__current_color
+
+    def select(self, color: str) -> None:
+        self.__current_color = color
+        self.__callback(color)
+
+    def set_color_from_marking(self, marking: Marking) -> None:
+        self.select(marking.latex_color)
+
+    def next_color(self) -> str:
+        #like KVColorsMenu, taking the next color doesn't notify the callback
+        self.__current_color = self.__colors.get_item()
+        return self.__current_color
+
+    def release_marking_color(self, marking: Marking) -> None:
+        self.__colors.release_item(marking.latex_color)
+
+    def update_options(self, generate_new_color: bool) -> None:
+        if generate_new_color:
+            self.__current_color = next(iter(DYNAMIC.Colors))
+        self.__colors.change_generator(iter(DYNAMIC.Colors), self.__current_color)
+
+    def trace_color(self, callback: Callable[[str], None]) -> None:
+        self.__callback = callback
+
+class SessionPlayer:
+    """a KVManager with the variables and the color menu that main.py would link to it"""
+    def __init__(self, canvas: Canvas, color_menu: HeadlessColorsMenu | None = None) -> None:
+        self.canvas: Canvas = canvas
+        self.manager: KVManager = KVManager(canvas)
+        self.color_menu = HeadlessColorsMenu() if color_menu is None else color_menu
+        self.__vars: StringVar | None = None
+        self.__vals: StringVar | None = None
+
+    def play(self, event: SessionEvent) -> None:
+        match event["event"]:
+            case "vars":
+                self.__vars = self.__set_or_link(self.__vars, event["value"], self.manager.link_vars)
+            case "vals":
+                self.__vals = self.__set_or_link(self.__vals, event["value"], self.manager.link_vals)
+            case "link_colors":
+                self.manager.link_marking_color(self.color_menu) # type: ignore[arg-type]
+            case "color":
+                self.color_menu.select(event["color"])
+            case "left_click":
+                self.manager.left_click(event["index"])
+            case "right_click":
+                self.manager.right_click(event["index"])
+            case "select_at":
+                self.manager.select_at(event["index"])
+            case "new_marking":
+                self.manager.new_marking()
+            case "different_marking":
+                self.manager.different_marking(event["offset"])
+            case "minimize":
+                self.manager.minimize()
+            case "resize":
+                self.__resize(event["width"], event["height"])
+            case unknown:
+                raise ValueError(f"unknown session event {unknown!r}")
+
+    def __set_or_link(self, variable: StringVar | None, value: str, link: Callable[[StringVar], None]) -> StringVar:
+        if variable is None:
+            variable = StringVar(self.canvas, value=value)
+            link(variable)
+        else:
+            variable.set(value)
+            #the recorded value is the one that got applied, so it doesn't wait for the next burst
+            self.manager.flush_input()
+        return variable
+
+    def __resize(self, width: int, height: int) -> None:
+        if isinstance(self.canvas, FakeCanvas):
+            self.canvas.width, self.canvas.height = width, height
+        else:
+            self.canvas.configure(width=width, height=height)
+            self.canvas.update_idletasks()
+        self.manager.on_resize(None) # type: ignore[arg-type]
+        self.manager.finish_resize()
+
+def replay(events: Iterable[SessionEvent], player: SessionPlayer) -> list[tuple[str, float]]:
+    """plays the events one after another and returns (event, seconds) for each of them"""
+    latencies: list[tuple[str, float]] = []
+    for event in events:
+        start = time.perf_counter()
+        player.play(event)
+        if not isinstance(player.canvas, FakeCanvas):
+            player.canvas.update_idletasks()
+        latencies.append((event["event"], time.perf_counter() - start))
+    return latencies
+
+def summarize(latencies: list[tuple[str, float]]) -> dict[str, dict[str, float]]:
+    """count, mean, 95th percentile and max (in milliseconds) per kind of event"""
+    by_event: dict[str, list[float]] = {}
+    for event, seconds in latencies:
+        by_event.setdefault(event, []).append(seconds * 1000)
+    return {
+        event: {
+            "count": len(times),
+            "mean_ms": statistics.fmean(times),
+            "p95_ms": statistics.quantiles(times, n=20, method="inclusive")[-1] if len(times) > 1 else times[0],
+            "max_ms": max(times)
+        } for event, times in by_event.items()
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="replays a recorded KV session and reports the latency of every event")
+    parser.add_argument("session", help="a .jsonl file written by SessionRecorder (main.py with KV_RECORD=path)")
+    parser.add_argument("--json", help="file the latencies of all events and the summary get written to")
+    parser.add_argument("--real", action="store_true", help="replay against a real Tk canvas instead of a FakeCanvas")
+    args = parser.parse_args()
+
+    if args.real:
+        from Globals.STATIC import get_root
+        canvas = Canvas(get_root())
+        canvas.pack(fill="both", expand=True)
+        canvas.update()
+    else:
+        canvas = FakeCanvas()
+    latencies = replay(read_session(args.session), SessionPlayer(canvas))
+    summary = summarize(latencies)
+    for event, stats in summary.items():
+        print(f"{event:<18} {stats['count']:>6} x  mean {stats['mean_ms']:8.2f}ms  p95 {stats['p95_ms']:8.2f}ms  max {stats['max_ms']:8.2f}ms", file=sys.stderr)
+    print(f"{'total':<18} {len(latencies):>6} x  {sum(s for _, s in latencies) * 1000:.1f}ms", file=sys.stderr)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"events": [{"event": e, "ms": s * 1000} for e, s in latencies], "summary": summary}, f, indent=1)
+
+if __name__ == "__main__":
+    main()
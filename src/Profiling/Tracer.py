@@ -0,0 +1,130 @@
+"""opt-in tracing of the event handlers and the frames they draw
+
+nothing gets recorded until TRACER.enable() is called (e.g. by starting main.py with KV_TRACE=trace.json),
+disabled spans cost a single attribute lookup.
+a span that isn't inside another span counts as a frame, frames that take longer than the budget get logged as "slow frame".
+the drawing code adds its own numbers (round trips, font switches, ...) to the open spans with count and annotate,
+they end up in the args of the spans and in the slow frame log.
+the spans can be exported as Chrome trace json (chrome://tracing or https://ui.perfetto.dev)"""
+from __future__ import annotations
+import json
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Any, ContextManager, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Shapes.CanvasRender import TclCallCounter
+
+LOGGER: logging.Logger = logging.getLogger("KV.trace")
+
+class Tracer:
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        #frames that take longer than this (in milliseconds) get logged
+        self.budget_ms: float = 16.0
+        self.__events: deque[dict[str, Any]] = deque(maxlen=100_000)
+        self.__call_counter: TclCallCounter | None = None
+        #the stack of open spans: (name, start in ns, Tk calls at the start, finished spans inside it, counts and annotations)
+        self.__stack: list[tuple[str, int, int, list[tuple[str, float]], dict[str, Any]]] = []
+        self.__disabled_span: ContextManager[None] = nullcontext()
+
+    def enable(self, budget_ms: float | None = None, max_events: int = 100_000) -> None:
+        if budget_ms is not None:
+            self.budget_ms = budget_ms
+        self.__events = deque(self.__events, maxlen=max_events)
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def watch(self, call_counter: TclCallCounter) -> None:
+        """the counter whose Tk calls get recorded with every span"""
+        self.__call_counter = call_counter
+
+    def span(self, name: str, **args: Any) -> ContextManager[None]:
+        """records the duration and the Tk calls of the with block"""
+        if not self.enabled:
+            return self.__disabled_span
+        return self.__span(name, args)
+
+    def count(self, **amounts: int) -> None:
+        """adds the amounts to the args of every open span, so the frame gets the sum of all of its steps"""
+        if not self.enabled:
+            return
+        for *_, counts in self.__stack:
+            for key, amount in amounts.items():
+                counts[key] = counts.get(key, 0) + amount
+
+    def annotate(self, **values: Any) -> None:
+        """sets the values in the args of every open span (e.g. the size of a pool after a step)"""
+        if not self.enabled:
+            return
+        [counts.update(values) for *_, counts in self.__stack]
+
+    @contextmanager
+    def __span(self, name: str, args: dict[str, Any]) -> Iterator[None]:
+        children: list[tuple[str, float]] = []
+        self.__stack.append((name, time.perf_counter_ns(), self.__tk_calls(), children, {}))
+        try:
+            yield
+        finally:
+            _, start, calls_before, _, counts = self.__stack.pop()
+            duration_ms: float = (time.perf_counter_ns() - start) / 1e6
+            tk_calls: int = self.__tk_calls() - calls_before
+            self.__events.append({
+                "name": name, "ph": "X", "pid": os.getpid(), "tid": 0,
+                "ts": start / 1e3, "dur": duration_ms * 1e3,
+                "args": {"tk_calls": tk_calls, **args, **counts}
+            })
+            if self.__stack:
+                #the frame gets the whole breakdown, not just its direct children
+                self.__stack[-1][3].append((name, duration_ms))
+                self.__stack[-1][3].extend(children)
+            elif duration_ms > self.budget_ms:
+                stages = ", ".join(f"{child} {child_ms:.1f}ms" for child, child_ms in children)
+                numbers = "".join(f", {key} {value}" for key, value in counts.items())
+                LOGGER.warning("slow frame: %s took %.1fms (budget %.1fms, %d Tk calls%s) [%s]", name, duration_ms, self.budget_ms, tk_calls, numbers, stages)
+
+    def __tk_calls(self) -> int:
+        return 0 if self.__call_counter is None else self.__call_counter.count
+
+    @property
+    def events(self) -> list[dict[str, Any]]:
+        return list(self.__events)
+
+    def clear(self) -> None:
+        self.__events.clear()
+
+    def write_chrome_trace(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+TRACER: Tracer = Tracer()
+
+def traced[**P, R](name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """decorator that runs every call of the function in a span of TRACER"""
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with TRACER.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def enable_from_environment() -> str | None:
+    """enables TRACER if KV_TRACE is set and returns its value (the path the trace should be written to)
+    KV_FRAME_BUDGET_MS sets the budget for the slow frame log"""
+    path = os.environ.get("KV_TRACE")
+    if not path:
+        return None
+    logging.basicConfig(level=logging.INFO)
+    budget = os.environ.get("KV_FRAME_BUDGET_MS")
+    TRACER.enable(float(budget) if budget else None)
+    return path
@@ -0,0 +1,78 @@
+from __future__ import annotations
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tkinter import Canvas
+
+class DirectRender:
+    """render backend that sends every change to the canvas right away (one Tcl round trip per change)"""
+    def __init__(self, canvas: Canvas) -> None:
+        self._canvas = canvas
+
+    def coords(self, item: int | str, *coords: float) -> None:
+        self._canvas.coords(item, *coords)
+
+    def itemconfig(self, item: int | str, **options: Any) -> None:
+        self._canvas.itemconfig(item, **options)
+
+    def scale(self, item: int | str, x_origin: float, y_origin: float, x_scale: float, y_scale: float) -> None:
+        self._canvas.scale(item, x_origin, y_origin, x_scale, y_scale)
+
+    def move(self, item: int | str, x_amount: float, y_amount: float) -> None:
+        self._canvas.move(item, x_amount, y_amount)
+
+    def flush(self) -> None:
+        pass
+
+class BatchedRender(DirectRender):
+    """render backend that collects the changes of a frame and sends them as one Tcl script on flush"""
+    def __init__(self, canvas: Canvas) -> None:
+        super().__init__(canvas)
+        self.__path: str = str(canvas)
+        self.__commands: list[str] = []
+
+    def coords(self, item: int | str, *coords: float) -> None:
+        self.__commands.append(f"{self.__path} coords {item} {' '.join(map(str, coords))}")
+
+    def itemconfig(self, item: int | str, **options: Any) -> None:
+        config = " ".join(f"-{key} {tcl_quote(value)}" for key, value in options.items())
+        self.__commands.append(f"{self.__path} itemconfigure {item} {config}")
+
+    def scale(self, item: int | str, x_origin: float, y_origin: float, x_scale: float, y_scale: float) -> None:
+        self.__commands.append(f"{self.__path} scale {item} {x_origin} {y_origin} {x_scale} {y_scale}")
+
+    def move(self, item: int | str, x_amount: float, y_amount: float) -> None:
+        self.__commands.append(f"{self.__path} move {item} {x_amount} {y_amount}")
+
+    def flush(self) -> None:
+        if self.__commands:
+            self._canvas.tk.eval("\n".join(self.__commands))
+            self.__commands.clear()
+
+__TCL_SPECIAL_CHARS: str = " \t;\"{}[]$\\"
+
+def tcl_quote(value: object) -> str:
+    """turns value into a single Tcl word by escaping every character that Tcl would interpret"""
+    text = str(value)
+    if not text:
+        return "{}"
+    return "".join("\\n" if c == "\n" else "\\" + c if c in __TCL_SPECIAL_CHARS else c for c in text)
+
+class TclCallCounter:
+    """counts the round trips of a widget into Tcl by standing in for the widget's tk object
+    everything except call and eval is passed through without counting"""
+    def __init__(self, widget: Canvas) -> None:
+        self.count: int = 0
+        self.__tk = widget.tk
+        widget.tk = self # type: ignore[assignment]
+
+    def call(self, *args: Any) -> Any:
+        self.count += 1
+        return self.__tk.call(*args)
+
+    def eval(self, script: str) -> Any:
+        self.count += 1
+        return self.__tk.eval(script)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__tk, name)
@@ -0,0 +1,31 @@
+"""the positions of the drawn items in cell units, computed once per diagram shape
+
+every coordinate the drawables use is offset + cell_size * (a number of cells), so the numbers of cells only depend on
+the shape of the diagram (width, height and the number of variables) and not on the size of the canvas.
+they are kept as flat tuples (x0, y0, x1, y1, ...) and a layout of the grid only is an affine transform of such a tuple"""
+from collections.abc import Callable, Sequence
+from functools import cache
+
+from .CanvasRender import DirectRender
+
+Points = tuple[float, ...]
+"""flat (x0, y0, x1, y1, ...) coordinates in cells, relative to the top left corner of the grid"""
+
+def to_canvas(points: Sequence[float], cell_size: float, x_offset: float, y_offset: float) -> list[float]:
+    """the canvas coordinates of the points for a grid with this layout (see KVGrid.grid_layout)"""
+    coords: list[float] = [0.0] * len(points)
+    coords[0::2] = [x * cell_size + x_offset for x in points[0::2]]
+    coords[1::2] = [y * cell_size + y_offset for y in points[1::2]]
+    return coords
+
+def move_items(render: DirectRender, ids: Sequence[int], coords: Sequence[float], stride: int) -> None:
+    """gives item i the coordinates coords[i*stride:(i+1)*stride]"""
+    [render.coords(id, *coords[i:i + stride]) for id, i in zip(ids, range(0, len(coords), stride))]
+
+@cache
+def cell_points(coordinate_table: Callable[[int], tuple[tuple[int, int], ...]], num_vars: int, x_in_cell: float, y_in_cell: float) -> Points:
+    """the point (x_in_cell, y_in_cell) of every cell, ordered by index
+
+    :param coordinate_table: the grid coordinate of every index of a diagram with num_vars variables (e.g. KVUtils.index_to_coordinate_table)
+    """
+    return tuple(c for x, y in coordinate_table(num_vars) for c in (x + x_in_cell, y + y_in_cell))
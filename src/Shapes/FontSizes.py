@@ -0,0 +1,53 @@
+import math
+from tkinter import Misc
+
+import tkinter.font as tkfont
+
+from .CanvasRender import DirectRender
+
+#font sizes grow in steps of 2**(1/8) (about 9%), small enough that a snapped text still fits its cell
+STEPS_PER_DOUBLING: int = 8
+
+def snap_font_size(size: float) -> int:
+    """rounds size down to the next size of the font size ladder (at least 1, Tk reads 0 as "default size")"""
+    if size < 1:
+        return 1
+    return max(1, int(2 ** (math.floor(math.log2(size) * STEPS_PER_DOUBLING) / STEPS_PER_DOUBLING)))
+
+#per Tk interpreter (by its address, so no widget is kept alive) the fonts by (family, size)
+_FONTS: dict[int, dict[tuple[str, int], tkfont.Font]] = {}
+
+def get_font(root: Misc, family: str, size: int) -> tkfont.Font:
+    """the shared font of a family and size, every size of the ladder gets created once per Tk interpreter and then reused"""
+    fonts = _FONTS.setdefault(root.tk.interpaddr(), {})
+    font = fonts.get((family, size))
+    if font is None:
+        font = fonts[(family, size)] = tkfont.Font(root=root, family=family, size=size)
+    return font
+
+class BucketFont:
+    """the font of all text items with one tag
+    instead of reconfiguring a font (which makes Tk measure every text that uses it on every resize)
+    the items get switched to the cached font of the new size, and only if the snapped size changed"""
+    #font switches of all BucketFonts since the start, for instrumentation
+    switches: int = 0
+
+    def __init__(self, root: Misc, family: str, tag: str, render: DirectRender, size: float = 12) -> None:
+        self.__root: Misc = root
+        self.__family: str = family
+        self.__tag: str = tag
+        self.__render: DirectRender = render
+        self.__size: int = snap_font_size(size)
+
+    @property
+    def font(self) -> tkfont.Font:
+        """the font that new items of the tag should be created with"""
+        return get_font(self.__root, self.__family, self.__size)
+
+    def set_size(self, size: float) -> None:
+        snapped: int = snap_font_size(size)
+        if snapped == self.__size:
+            return
+        self.__size = snapped
+        self.__render.itemconfig(self.__tag, font=self.font)
+        BucketFont.switches += 1
@@ -0,0 +1,29 @@
+from tkinter import Canvas
+
+from .CanvasRender import DirectRender
+from .CellLayout import move_items, to_canvas
+from .KVDrawable import KVDrawable
+from .KVGrid import KVGrid
+
+class KVCellTexts(KVDrawable):
+    """base for drawables with one text item per cell (the text of index i belongs to the cell of index i)
+    all texts share a tag, so hiding and showing them is a single canvas operation"""
+    def __init__(self, canvas: Canvas, tag: str, render: DirectRender | None = None) -> None:
+        super().__init__(canvas, render)
+        self._tag: str = tag
+        self.__all_shown: bool = True
+
+    def _draw_texts(self, ids: list[int], kv_grid: KVGrid, x_in_cell: float, y_in_cell: float, visible: bool) -> None:
+        """moves the texts to their cells (x_in_cell, y_in_cell are the offsets inside the cell, in cells)
+
+        :param visible: False hides all texts without moving them (e.g. because they would be too small to read)
+        """
+        if not visible:
+            #also hides texts that were created since the last frame
+            self._render.itemconfig(self._tag, state="hidden")
+            self.__all_shown = False
+            return
+        if not self.__all_shown:
+            self._render.itemconfig(self._tag, state="normal")
+            self.__all_shown = True
+        move_items(self._render, ids, to_canvas(kv_grid.index_points(x_in_cell, y_in_cell), *kv_grid.grid_layout), 2)
@@ -1,8 +1,11 @@
 from tkinter import Canvas
 
+from .CanvasRender import DirectRender
+
 class KVDrawable:
-    def __init__(self, canvas: Canvas) -> None:
+    def __init__(self, canvas: Canvas, render: DirectRender | None = None) -> None:
         self._canvas = canvas
+        self._render: DirectRender = DirectRender(canvas) if render is None else render
     
     def _delete_item(self, item: int) -> None:
         self._canvas.delete(item)
\ No newline at end of file
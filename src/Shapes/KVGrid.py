@@ -1,10 +1,17 @@
+from .CanvasRender import DirectRender
+from .CellLayout import Points, cell_points
 from .KVDrawable import KVDrawable
+from KV_Diagramm import KVUtils
+from KV_Diagramm.Dataclasses.Marking import Marking, MarkingData
 from tkinter import Canvas
 import IterTools
 
+GridLayout = tuple[float, float, float]
+"""(cell_size, x_offset, y_offset) of a drawn grid"""
+
 class KVGrid(KVDrawable):
-    def __init__(self, canvas: Canvas, num_cols: int = 1, num_rows: int = 1) -> None:
-        super().__init__(canvas)
+    def __init__(self, canvas: Canvas, num_cols: int = 1, num_rows: int = 1, render: DirectRender | None = None) -> None:
+        super().__init__(canvas, render)
         self.__col_ids: list[int] = []
         self.__row_ids: list[int] = []
         self.update(num_cols, num_rows)
@@ -24,6 +31,10 @@ class KVGrid(KVDrawable):
     def y_offset(self) -> float:
         return self.__y_offset
 
+    @property
+    def grid_layout(self) -> GridLayout:
+        return self.__cell_size, self.__x_offset, self.__y_offset
+
     def update(self, num_cols: int, num_rows: int) -> None:
         #how many vars need to fit to the left (analog to int(math.log(num_rows, 2))) (only need since thy take up half a cell)
         self.__x_offset_cells: int = num_rows.bit_length() // 2 
@@ -32,26 +43,59 @@ class KVGrid(KVDrawable):
         IterTools.ensure_count(self.__row_ids, num_rows - 1, self.__make_line, self._delete_item)
         IterTools.ensure_count(self.__col_ids, num_cols - 1, self.__make_line, self._delete_item)
 
+    def _size_in_cells(self) -> tuple[float, float, float, float]:
+        """(width, height) of the drawn cells and (left, top) space for the variables, all in cells"""
+        return len(self.__col_ids) + 1, len(self.__row_ids) + 1, self.__x_offset_cells, self.__y_offset_cells
+
+    def layout(self, canvas_width: float, canvas_height: float) -> GridLayout:
+        """the cell size and offsets the grid gets on a canvas of the given size"""
+        width_cells, height_cells, left_cells, top_cells = self._size_in_cells()
+        cell_size = min(canvas_width / (left_cells + width_cells + 1), canvas_height / (top_cells + height_cells + 1))
+        x_offset = max(left_cells * cell_size, (canvas_width - cell_size * width_cells) / 2)
+        y_offset = max(top_cells * cell_size, (canvas_height - cell_size * height_cells) / 2)
+        return cell_size, x_offset, y_offset
+
+    def set_layout(self, layout: GridLayout) -> None:
+        """takes over a layout without moving the lines (for when the canvas already moved them, e.g. with scale)"""
+        self.__cell_size, self.__x_offset, self.__y_offset = layout
+
     def draw(self, canvas_width: float, canvas_height: float) -> None:
-        x_total: float = self.__x_offset_cells + len(self.__col_ids) + 2
-        y_total: float = self.__y_offset_cells + len(self.__row_ids) + 2
-        self.__cell_size = min(canvas_width / x_total, canvas_height / y_total)
+        self.set_layout(self.layout(canvas_width, canvas_height))
         width: float = self.__cell_size * (len(self.__col_ids) + 1)
         height: float = self.__cell_size * (len(self.__row_ids) + 1)
-        self.__x_offset = max(self.__x_offset_cells * self.__cell_size, (canvas_width - width) / 2)
-        self.__y_offset = max(self.__y_offset_cells * self.__cell_size, (canvas_height - height) / 2)
         x_max = self.__x_offset + width
         y_max = self.__y_offset + height
 
         for index, col_id in enumerate(self.__col_ids):
             x = self.__x_offset + self.__cell_size * (index + 1)
-            self._canvas.coords(col_id,x , self.__y_offset, x, y_max)
+            self._render.coords(col_id,x , self.__y_offset, x, y_max)
         for index, row_id in enumerate(self.__row_ids):
             y = self.__y_offset + self.__cell_size * (index + 1)
-            self._canvas.coords(row_id, self.__x_offset, y, x_max, y)
+            self._render.coords(row_id, self.__x_offset, y, x_max, y)
 
     def __make_line(self, i: int = 0) -> int:
         return self._canvas.create_line(0,0,0,0)
     
     def grid_to_canvas_coord(self, x: float, y: float) -> tuple[float, float]:
-        return x * self.__cell_size + self.__x_offset, y * self.cell_size + self.__y_offset
\ No newline at end of file
+        return x * self.__cell_size + self.__x_offset, y * self.cell_size + self.__y_offset
+
+    def index_points(self, x_in_cell: float, y_in_cell: float) -> Points:
+        """the point (x_in_cell, y_in_cell) of every cell in cells, ordered by index (cached per diagram shape, see CellLayout)"""
+        return cell_points(KVUtils.index_to_coordinate_table, KVUtils.vars_for_cells((len(self.__col_ids) + 1) * (len(self.__row_ids) + 1)), x_in_cell, y_in_cell)
+
+    def canvas_to_index(self, canvas_x: float, canvas_y: float) -> int:
+        """the index of the cell at the canvas position (-1 if there is none)"""
+        x: int = int((canvas_x - self.__x_offset) // self.__cell_size)
+        y: int = int((canvas_y - self.__y_offset) // self.__cell_size)
+        num_cols, num_rows = len(self.__col_ids) + 1, len(self.__row_ids) + 1
+        if x < 0 or x >= num_cols or y < 0 or y >= num_rows:
+            return -1
+        return KVUtils.coordinate_to_index_table(KVUtils.vars_for_cells(num_cols * num_rows))[y][x]
+
+    def marking_rects(self, marking: Marking) -> list[MarkingData]:
+        """the rectangles (in grid coordinates) a marking gets drawn with"""
+        return marking.drawables
+
+    def resize_font(self, cell_size: float) -> None:
+        """the grid has no texts"""
+        pass
@@ -1,17 +1,18 @@
-from KV_Diagramm import KVUtils
 from Globals.STATIC import FONTS
 from tkinter import Canvas
 
-from .KVDrawable import KVDrawable
+from .CanvasRender import DirectRender
+from .KVCellTexts import KVCellTexts
+from .FontSizes import BucketFont
 from .KVGrid import KVGrid
 
 import IterTools
-import tkinter.font as tkfont
 
-class KVIndices(KVDrawable):
-    def __init__(self, canvas: Canvas) -> None:
-        super().__init__(canvas)
-        self.__font = tkfont.Font(family=FONTS.TYPE)
+class KVIndices(KVCellTexts):
+    __TAG: str = "KVIndex"
+    def __init__(self, canvas: Canvas, render: DirectRender | None = None) -> None:
+        super().__init__(canvas, KVIndices.__TAG, render)
+        self.__font: BucketFont = BucketFont(canvas, FONTS.TYPE, KVIndices.__TAG, self._render)
         self.__index_ids: list[int] = []
     
     def update(self, num_indices: int):
@@ -21,13 +22,15 @@ class KVIndices(KVDrawable):
             return self.__make_text(str(i))
         IterTools.ensure_count(self.__index_ids, num_indices, factory, self._delete_item)
     
-    def draw(self, kv_grid: KVGrid) -> None:
-        self.__font.configure(size=int(kv_grid.cell_size // 6))
-        low_in_cell_x: float = 0.8 * kv_grid.cell_size
-        low_in_cell_y: float = 0.85 * kv_grid.cell_size
-        for index, id in enumerate(self.__index_ids):
-            x,y = kv_grid.grid_to_canvas_coord(*KVUtils.IndexToCoordinate(index))
-            self._canvas.coords(id, x + low_in_cell_x, y + low_in_cell_y)
+    def resize_font(self, cell_size: float) -> None:
+        """switches the texts to the font size of the ladder that fits cell_size (nothing happens if it stays the same)"""
+        self.__font.set_size(cell_size / 6)
+
+    def draw(self, kv_grid: KVGrid, visible: bool = True) -> None:
+        if visible:
+            self.resize_font(kv_grid.cell_size)
+        #low in the cell, so the value in the center stays readable
+        self._draw_texts(self.__index_ids, kv_grid, 0.8, 0.85, visible)
     
     def __make_text(self, text: str) -> int:
-        return self._canvas.create_text(0,0,text=text, font=self.__font)
\ No newline at end of file
+        return self._canvas.create_text(0,0,text=text, font=self.__font.font, tags=(self._tag,))
\ No newline at end of file
@@ -1,76 +1,166 @@
+from collections.abc import Collection
+from functools import cache
 from tkinter import Canvas
 
 import IterTools
-from KV_Diagramm.Dataclasses.Marking import Marking
-from KV_Diagramm.Dataclasses.Edge import Edge, EDGES, Edge_Lines
+from KV_Diagramm.Dataclasses.KVData import KVDataEvent
+from KV_Diagramm.Dataclasses.Marking import Marking, MarkingData
+from KV_Diagramm.Dataclasses.Edge import Edge
 
+from .CanvasRender import DirectRender
+from .CellLayout import Points, to_canvas
 from .KVDrawable import KVDrawable
 from .KVGrid import KVGrid
+from .LinePool import LinePool
+
+#a path is the corners a line goes through, the corners of a rectangle are numbered top left, top right, bottom right, bottom left
+Path = tuple[int, ...]
+#the sides of a rectangle clockwise from the top left corner as (edge, start corner, end corner)
+__SIDES: tuple[tuple[Edge, int, int], ...] = ((Edge.TOP, 0, 1), (Edge.RIGHT, 1, 2), (Edge.BOTTOM, 2, 3), (Edge.LEFT, 3, 0))
+
+@cache
+def edge_paths(edges: Edge) -> tuple[Path, ...]:
+    """the fewest lines that draw the edges: every run of neighbouring sides becomes one polyline
+    (two lines only if the edges are opposite sides, none if all edges are open)"""
+    present: list[bool] = [edge in edges for edge, _, _ in __SIDES]
+    if all(present):
+        return ((0, 1, 2, 3, 0),)
+    if not any(present):
+        return ()
+    #start the walk at a side that follows an open one, so no run gets split
+    start: int = next(i for i in range(4) if present[i] and not present[i - 1])
+    paths: list[Path] = []
+    path: list[int] = []
+    for i in ((start + k) % 4 for k in range(4)):
+        _, begin, end = __SIDES[i]
+        if present[i]:
+            path = path or [begin]
+            path.append(end)
+        elif path:
+            paths.append(tuple(path))
+            path = []
+    if path:
+        paths.append(tuple(path))
+    return tuple(paths)
+
+@cache
+def edge_sides(edges: Edge) -> tuple[Path, ...]:
+    """a line for every edge"""
+    return tuple((begin, end) for edge, begin, end in __SIDES if edge in edges)
 
 class KVMarkings(KVDrawable):
     __SLIM_WIDTH: int = 2
     __THICK_WIDTH: int = 4
-    def __init__(self, canvas: Canvas) -> None:
-        super().__init__(canvas)
-        self.__marking_ids: dict[str, list[Edge_Lines]] = {}
+    #the width of the highlighted markings (e.g. the ones under the mouse) that aren't selected
+    __HOVER_WIDTH: int = 3
+    #the lines are drawn this many cells inside the cells of the rectangle
+    __MARKING_OFFSET: float = 0.05
+    def __init__(self, canvas: Canvas, render: DirectRender | None = None, polylines: bool = True) -> None:
+        """:param polylines: draw the edges of a rectangle with one line item (two for opposite edges) instead of one line per edge"""
+        super().__init__(canvas, render)
+        self.__paths = edge_paths if polylines else edge_sides
+        #per marking and rectangle the lines of the paths of the rectangle
+        self.__marking_ids: dict[str, list[list[int]]] = {}
+        #per marking the points of all its lines in cells (see CellLayout) and the number of coordinates of every line,
+        #they only change with the rectangles, a new layout of the grid only transforms them
+        self.__marking_points: dict[str, tuple[Points, tuple[int, ...]]] = {}
         self.__selected_tag: str = ""
+        self.__hovered_tags: set[str] = set()
+        #the lines of the edges are borrowed from the pool, so clicking through markings doesn't create and delete canvas items
+        self.__line_pool: LinePool = LinePool(canvas, self._render)
+
+    def on_kv_data_changed(self, event: KVDataEvent, marking: Marking | None) -> None:
+        """listener for KVData, handles the events that don't depend on the layout (a changed cube needs the grid, see KVDrawer)"""
+        if marking is None:
+            return
+        match event:
+            case KVDataEvent.MARKING_ADDED:
+                self.new_marking(marking)
+            case KVDataEvent.MARKING_REMOVED:
+                self.delete_marking(marking.TAG)
+            case KVDataEvent.MARKING_SELECTED:
+                self.update_selected(marking)
+            case KVDataEvent.MARKING_COLOR_CHANGED:
+                self.set_color(marking.TAG, marking.tkinter_color)
+            case _:
+                pass
+
+    @property
+    def line_pool(self) -> LinePool:
+        return self.__line_pool
 
     def set_color(self, tag: str, col: str) -> None:
-        self._canvas.itemconfig(tag, fill=col)
+        self._render.itemconfig(tag, fill=col)
 
     def update_selected(self, selected: Marking):
-        if self.__selected_tag:
-            self._canvas.itemconfig(self.__selected_tag, width=self.__SLIM_WIDTH)
-        self.__selected_tag = selected .TAG
-        self._canvas.itemconfig(selected.TAG, width=self.__THICK_WIDTH)
+        old_tag, self.__selected_tag = self.__selected_tag, selected.TAG
+        if old_tag:
+            self._render.itemconfig(old_tag, width=self.__line_width(old_tag))
+        self._render.itemconfig(selected.TAG, width=self.__THICK_WIDTH)
+
+    def set_hovered(self, tags: Collection[str]) -> None:
+        """highlights the markings of tags, the ones that were highlighted before and aren't in tags go back to normal"""
+        hovered: set[str] = set(tags)
+        changed: set[str] = hovered ^ self.__hovered_tags
+        self.__hovered_tags = hovered
+        [self._render.itemconfig(tag, width=self.__line_width(tag)) for tag in changed]
+
+    def __line_width(self, tag: str) -> int:
+        if tag == self.__selected_tag:
+            return self.__THICK_WIDTH
+        return self.__HOVER_WIDTH if tag in self.__hovered_tags else self.__SLIM_WIDTH
 
     def delete_marking(self, tag: str):
-        self._canvas.delete(tag)
+        self.__hovered_tags.discard(tag)
+        for lines in self.__marking_ids.get(tag, []):
+            self.__give_back_lines(lines)
         if tag == self.__selected_tag:
-            for edge_line in self.__marking_ids[tag]:
-                edge_line.reset()
+            self.__marking_points[tag] = ((), ())
         else:
             self.__marking_ids.pop(tag)
+            self.__marking_points.pop(tag, None)
 
     def new_marking(self, marking: Marking) -> None:
-        self.__marking_ids[marking.TAG] = [Edge_Lines() for _ in range(len(marking.drawables))]
+        self.__marking_ids[marking.TAG] = [[] for _ in range(len(marking.drawables))]
         self.update_marking(marking)
 
-    def update_marking(self, marking: Marking) -> None:
+    def update_marking(self, marking: Marking, rects: list[MarkingData] | None = None) -> None:
+        """:param rects: the rectangles to draw the marking with (marking.drawables if None)"""
         assert(marking.TAG in self.__marking_ids)
-        edge_lines = self.__marking_ids[marking.TAG]
-        if marking.drawables:
-            IterTools.ensure_count(edge_lines, len(marking.drawables), lambda _: Edge_Lines(), lambda x: x.delete(self._canvas))
+        rects = marking.drawables if rects is None else rects
+        rect_lines = self.__marking_ids[marking.TAG]
+        if rects:
+            IterTools.ensure_count(rect_lines, len(rects), lambda _: [], self.__give_back_lines)
         elif self.__marking_ids[marking.TAG]:
-            self._canvas.delete(marking.TAG)
+            [self.__give_back_lines(lines) for lines in rect_lines]
             self.__marking_ids[marking.TAG] = []
-        for markingdata, edge_line in zip(marking.drawables, edge_lines):
-            self.__set_lines(markingdata.edges, edge_line, marking.tkinter_color, marking.TAG, marking.TAG == self.__selected_tag)
+        line_width = self.__line_width(marking.TAG)
+        for markingdata, lines in zip(rects, rect_lines):
+            IterTools.ensure_count(lines, len(self.__paths(markingdata.edges)),
+                                   lambda _: self.__line_pool.borrow(marking.TAG, marking.tkinter_color, line_width), self.__line_pool.give_back)
+        self.__marking_points[marking.TAG] = self.__rect_points(rects)
+
+    def __rect_points(self, rects: list[MarkingData]) -> tuple[Points, tuple[int, ...]]:
+        offset: float = self.__MARKING_OFFSET
+        points: list[float] = []
+        lengths: list[int] = []
+        for r in rects:
+            x1, y1, x2, y2 = r.x1 + offset, r.y1 + offset, r.x2 - offset, r.y2 - offset
+            corners = ((x1, y1), (x2, y1), (x2, y2), (x1, y2))
+            for path in self.__paths(r.edges):
+                points.extend(c for corner in path for c in corners[corner])
+                lengths.append(2 * len(path))
+        return tuple(points), tuple(lengths)
     
     def draw_marking(self, kv_grid: KVGrid, marking: Marking) -> None:
-        marking_offset: float = 0.05
-
-        for i, marking_data in enumerate(marking.drawables):
-            x1, y1 = kv_grid.grid_to_canvas_coord(marking_data.x1 + marking_offset, marking_data.y1 + marking_offset)
-            x2, y2 = kv_grid.grid_to_canvas_coord(marking_data.x2 - marking_offset, marking_data.y2 - marking_offset)
-            edge_lines = self.__marking_ids[marking.TAG][i]
-            if edge_lines[Edge.LEFT]:
-                self._canvas.coords(edge_lines[Edge.LEFT], x1, y1, x1, y2)
-            if edge_lines[Edge.RIGHT]:
-                self._canvas.coords(edge_lines[Edge.RIGHT], x2, y1, x2, y2)
-            if edge_lines[Edge.TOP]:
-                self._canvas.coords(edge_lines[Edge.TOP], x1, y1, x2, y1)
-            if edge_lines[Edge.BOTTOM]:
-                self._canvas.coords(edge_lines[Edge.BOTTOM], x1, y2, x2, y2)
-
-    def __set_lines(self, edge: Edge, ids: Edge_Lines, col: str, tag: str, is_selected: bool):
-        line_width = self.__THICK_WIDTH if is_selected else self.__SLIM_WIDTH
-        for edge_to_check in EDGES:
-            self.__set_line(edge, edge_to_check, ids, col, tag, line_width)
-    
-    def __set_line(self, edge: Edge, edge_to_check: Edge, ids: Edge_Lines, col: str, tag: str, line_width: int):
-        if edge_to_check in edge:
-            if not ids[edge_to_check]:
-                ids[edge_to_check] = self._canvas.create_line(0,0,0,0, width=line_width, fill=col, tags=(tag,))
-        elif ids[edge_to_check]:
-            self._canvas.delete(ids.delete_item(edge_to_check))
\ No newline at end of file
+        points, lengths = self.__marking_points.get(marking.TAG, ((), ()))
+        coords: list[float] = to_canvas(points, *kv_grid.grid_layout)
+        lines = (line for rect_lines in self.__marking_ids[marking.TAG] for line in rect_lines)
+        position: int = 0
+        for line, length in zip(lines, lengths):
+            self._render.coords(line, *coords[position:position + length])
+            position += length
+
+    def __give_back_lines(self, lines: list[int]) -> None:
+        [self.__line_pool.give_back(line) for line in lines]
+        lines.clear()
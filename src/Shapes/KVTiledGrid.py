@@ -0,0 +1,123 @@
+from functools import cache
+from tkinter import Canvas
+
+from Globals.STATIC import FONTS
+from KV_Diagramm import KVUtils
+from KV_Diagramm.Dataclasses.Cube import Cube
+from KV_Diagramm.Dataclasses.Marking import Marking, MarkingData
+import IterTools
+
+from .CanvasRender import DirectRender
+from .CellLayout import Points, cell_points
+from .FontSizes import BucketFont
+from .KVGrid import GridLayout, KVGrid
+
+#the variables of one tile, the tiles themselves are a KV diagram of the remaining variables
+TILE_VARS: int = 4
+TILE_SIZE: int = 4
+#cells between two tiles, the label of a tile sits in the gap below it
+TILE_GAP: int = 1
+TILE_PITCH: int = TILE_SIZE + TILE_GAP
+
+@cache
+def tiled_index_to_coordinate_table(num_vars: int) -> tuple[tuple[int, int], ...]:
+    """the grid coordinate of every index of a tiled diagram (table[index] = (x, y), the gaps between the tiles count as cells)
+    the lowest TILE_VARS bits of an index select the cell inside its tile, the others select the tile"""
+    inner_table = KVUtils.index_to_coordinate_table(TILE_VARS)
+    outer_table = KVUtils.index_to_coordinate_table(num_vars - TILE_VARS)
+    return tuple((tile_x * TILE_PITCH + x, tile_y * TILE_PITCH + y) for tile_x, tile_y in outer_table for x, y in inner_table)
+
+class KVTiledGrid(KVGrid):
+    """a KV diagram of many variables drawn as a grid of 4 variable diagrams (tiles)
+    every tile has the layout of the first 4 variables, so the variable brackets only get drawn once for the top left tile,
+    the tiles are arranged like a KV diagram of the other variables and get labeled with their values"""
+    __LABEL_TAG: str = "KVTileLabel"
+
+    def __init__(self, canvas: Canvas, render: DirectRender | None = None) -> None:
+        super().__init__(canvas, render=render)
+        #per tile: border, inner vertical lines, inner horizontal lines, label
+        self.__tile_ids: list[list[int]] = []
+        self.__num_vars: int = 0
+        self.__tiles_x: int = 0
+        self.__tiles_y: int = 0
+        self.__labels: list[str] = []
+        self.__font: BucketFont = BucketFont(canvas, FONTS.TYPE, KVTiledGrid.__LABEL_TAG, self._render)
+
+    def update_tiles(self, vars: list[str]) -> None:
+        """sets the variables of the diagram (an empty list removes all tiles)"""
+        self.__num_vars = len(vars)
+        outer_vars = vars[TILE_VARS:]
+        self.__tiles_x, self.__tiles_y = KVUtils.get_kv_dimensions(len(outer_vars)) if vars else (0, 0)
+        IterTools.ensure_count(self.__tile_ids, self.__tiles_x * self.__tiles_y, self.__make_tile, self.__delete_tile)
+        names = ",".join(outer_vars)
+        for outer_index, tile_ids in enumerate(self.__tile_ids):
+            label = f"{names}={''.join(str(outer_index >> bit & 1) for bit in range(len(outer_vars)))}"
+            if outer_index >= len(self.__labels):
+                self.__labels.append(label)
+            elif self.__labels[outer_index] == label:
+                continue
+            self.__labels[outer_index] = label
+            self._render.itemconfig(tile_ids[-1], text=label)
+        del self.__labels[len(self.__tile_ids):]
+
+    def _size_in_cells(self) -> tuple[float, float, float, float]:
+        return self.__tiles_x * TILE_PITCH - TILE_GAP, self.__tiles_y * TILE_PITCH, 1, 1
+
+    def draw(self, canvas_width: float, canvas_height: float) -> None:
+        layout: GridLayout = self.layout(canvas_width, canvas_height)
+        self.set_layout(layout)
+        cell_size = layout[0]
+        self.resize_font(cell_size)
+        size: float = TILE_SIZE * cell_size
+        coordinate_table = KVUtils.index_to_coordinate_table(KVUtils.vars_for_cells(len(self.__tile_ids)))
+        for tile_ids, (tile_x, tile_y) in zip(self.__tile_ids, coordinate_table):
+            x, y = self.grid_to_canvas_coord(tile_x * TILE_PITCH, tile_y * TILE_PITCH)
+            border, *lines, label = tile_ids
+            self._render.coords(border, x, y, x + size, y + size)
+            for i in range(1, TILE_SIZE):
+                self._render.coords(lines[i - 1], x + i * cell_size, y, x + i * cell_size, y + size)
+                self._render.coords(lines[TILE_SIZE + i - 2], x, y + i * cell_size, x + size, y + i * cell_size)
+            self._render.coords(label, x + size / 2, y + size + TILE_GAP * cell_size / 2)
+
+    def resize_font(self, cell_size: float) -> None:
+        self.__font.set_size(cell_size / 3)
+
+    def index_points(self, x_in_cell: float, y_in_cell: float) -> Points:
+        return cell_points(tiled_index_to_coordinate_table, self.__num_vars, x_in_cell, y_in_cell)
+
+    def canvas_to_index(self, canvas_x: float, canvas_y: float) -> int:
+        x: int = int((canvas_x - self.x_offset) // self.cell_size)
+        y: int = int((canvas_y - self.y_offset) // self.cell_size)
+        tile_x, x_in_tile = divmod(x, TILE_PITCH)
+        tile_y, y_in_tile = divmod(y, TILE_PITCH)
+        if x < 0 or y < 0 or tile_x >= self.__tiles_x or tile_y >= self.__tiles_y or x_in_tile >= TILE_SIZE or y_in_tile >= TILE_SIZE:
+            return -1
+        outer_index: int = KVUtils.coordinate_to_index_table(self.__num_vars - TILE_VARS)[tile_y][tile_x]
+        return outer_index << TILE_VARS | KVUtils.coordinate_to_index_table(TILE_VARS)[y_in_tile][x_in_tile]
+
+    def marking_rects(self, marking: Marking) -> list[MarkingData]:
+        """the part of the cube inside a tile is the same for every tile, it gets drawn into every tile of the outer part of the cube"""
+        if marking.cube is None:
+            return []
+        cube = marking.cube
+        inner_mask: int = (1 << TILE_VARS) - 1
+        outer_mask: int = (1 << (self.__num_vars - TILE_VARS)) - 1
+        inner_rects = MarkingData.from_cube(Cube(cube.free_mask & inner_mask, cube.value & inner_mask), TILE_SIZE, TILE_SIZE)
+        outer_cube = Cube(cube.free_mask >> TILE_VARS & outer_mask, cube.value >> TILE_VARS & outer_mask)
+        coordinate_table = KVUtils.index_to_coordinate_table(self.__num_vars - TILE_VARS)
+        rects: list[MarkingData] = []
+        for outer_index in outer_cube.indices():
+            tile_x, tile_y = coordinate_table[outer_index]
+            x, y = tile_x * TILE_PITCH, tile_y * TILE_PITCH
+            rects.extend(MarkingData(r.x1 + x, r.y1 + y, r.x2 + x, r.y2 + y, r.edges) for r in inner_rects)
+        return rects
+
+    def __make_tile(self, i: int = 0) -> list[int]:
+        return [
+            self._canvas.create_rectangle(0,0,0,0, width=2),
+            *(self._canvas.create_line(0,0,0,0) for _ in range(2 * (TILE_SIZE - 1))),
+            self._canvas.create_text(0,0, font=self.__font.font, tags=(KVTiledGrid.__LABEL_TAG,))
+        ]
+
+    def __delete_tile(self, tile_ids: list[int]) -> None:
+        self._canvas.delete(*tile_ids)
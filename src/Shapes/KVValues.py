@@ -1,47 +1,52 @@
 from tkinter import Canvas
 
-from KV_Diagramm import KVUtils
 from Globals.STATIC import FONTS
 import IterTools
 
-import tkinter.font as tkfont
-
 from .KVGrid import KVGrid
-from .KVDrawable import KVDrawable
+from .CanvasRender import DirectRender
+from .KVCellTexts import KVCellTexts
+from .FontSizes import BucketFont
 
-class KVValues(KVDrawable):
-    def __init__(self, canvas: Canvas) -> None:
-        super().__init__(canvas)
-        self.__font = tkfont.Font(family=FONTS.TYPE, size=12)
+class KVValues(KVCellTexts):
+    __TAG: str = "KVValue"
+    def __init__(self, canvas: Canvas, render: DirectRender | None = None) -> None:
+        super().__init__(canvas, KVValues.__TAG, render)
+        self.__font: BucketFont = BucketFont(canvas, FONTS.TYPE, KVValues.__TAG, self._render)
         self.__values: str = ""
         self.__val_ids: list[int] = []
     
-    def update(self, new_values: str | None, max_num_values: int) -> None:
+    def update(self, new_values: str | None, max_num_values: int) -> bool:
+        """changes the texts in place and returns whether texts were added or removed (only then they need to be drawn again)"""
         if new_values == self.__values:
-            return
+            return False
         if new_values is None:
-            self.__resize_val_ids(self.__values, max_num_values)
-        else:
-            self.__resize_val_ids(new_values, max_num_values)
-            self.__update_text_contents(new_values)
-            self.__values = new_values
+            return self.__resize_val_ids(self.__values, max_num_values)
+        resized: bool = self.__resize_val_ids(new_values, max_num_values)
+        self.__update_text_contents(new_values)
+        self.__values = new_values
+        return resized
     
-    def __resize_val_ids(self, new_values: str, max_num_values: int) -> None:
+    def __resize_val_ids(self, new_values: str, max_num_values: int) -> bool:
         def factory(i: int) -> int:
             return self.__make_text(new_values[i])
+        old_count: int = len(self.__val_ids)
         IterTools.ensure_count(self.__val_ids, min(len(new_values), max_num_values), factory, self._delete_item)
+        return len(self.__val_ids) != old_count
     
     def __update_text_contents(self, new_values: str) -> None:
         def update_text_at_index(index: int, new_value: str) -> None:
-            self._canvas.itemconfig(self.__val_ids[index], text=new_value)
+            self._render.itemconfig(self.__val_ids[index], text=new_value)
         [update_text_at_index(i, n_v) for i, (n_v, o_v) in enumerate(zip(new_values, self.__values)) if n_v != o_v]
 
-    def draw(self, kv_grid: KVGrid):
-        self.__font.configure(size=int(kv_grid.cell_size // 2))
-        cell_center = 0.5*kv_grid.cell_size
-        for index, id in enumerate(self.__val_ids):
-            x,y = kv_grid.grid_to_canvas_coord(*KVUtils.IndexToCoordinate(index))
-            self._canvas.coords(id, x + cell_center, y + cell_center)
+    def resize_font(self, cell_size: float) -> None:
+        """switches the texts to the font size of the ladder that fits cell_size (nothing happens if it stays the same)"""
+        self.__font.set_size(cell_size / 2)
+
+    def draw(self, kv_grid: KVGrid, visible: bool = True):
+        if visible:
+            self.resize_font(kv_grid.cell_size)
+        self._draw_texts(self.__val_ids, kv_grid, 0.5, 0.5, visible)
     
     def __make_text(self, value: str) -> int:
-        return self._canvas.create_text(0,0, text=value, font=self.__font)
+        return self._canvas.create_text(0,0, text=value, font=self.__font.font, tags=(self._tag,))
@@ -1,46 +1,58 @@
 from __future__ import annotations
 from collections.abc import Callable
+from functools import cache
 from DataStructures.KVVarIDs import KVVarIDs, LineTextPair
 from DataStructures.IDiedString import IDiedString
 from Globals.STATIC import FONTS
 from tkinter import Canvas
 
-import tkinter.font as tkfont
-
+from .CanvasRender import DirectRender
+from .CellLayout import Points, move_items, to_canvas
+from .FontSizes import BucketFont
 from .KVDrawable import KVDrawable
 from .KVGrid import KVGrid
 
-class _LayerLayout:
-    def __init__(self, layer_index: int, kv_grid: KVGrid, is_left: bool) -> None:
-        depth = (kv_grid.x_offset if is_left else kv_grid.y_offset) - layer_index * kv_grid.cell_size / 2
-        self.line_length: int = 2**(layer_index + 1) * kv_grid.cell_size
-        self.grid_start: float = (kv_grid.y_offset if is_left else kv_grid.x_offset) + self.line_length / 2
-        self.grid_offset: float = depth - 0.1 * kv_grid.cell_size
-        self.text_offset: float = depth - 0.25 * kv_grid.cell_size
-
-class _Line:
-    def __init__(self, segment_index: int, layout: _LayerLayout) -> None:
-        self.layout: _LayerLayout = layout
-        self.start: float = layout.grid_start + 2 * segment_index * layout.line_length
-        self.end: float = self.start + layout.line_length
-    
-    @property
-    def middle(self) -> float:
-        return (self.start + self.end) / 2
+@cache
+def var_points(num_vars: int, is_left: bool) -> tuple[Points, Points]:
+    """the lines (x0, y0, x1, y1 each) and the texts (x, y each) of the variables of one side in cells, see CellLayout
+    in the order KVVarIDs has them: layer by layer from the leafes and the line of the last variable (val) at the end"""
+    lines: list[float] = []
+    texts: list[float] = []
+    def add(layer_index: int, segment_index: int, length: float) -> None:
+        #the layers go outwards by half a cell, a line covers the cells in which its variable is 1
+        depth: float = -layer_index / 2
+        line_length: float = 2**(layer_index + 1)
+        start: float = line_length / 2 + 2 * segment_index * line_length
+        end: float = start + length
+        middle: float = (start + end) / 2
+        if is_left:
+            lines.extend((depth - 0.1, start, depth - 0.1, end))
+            texts.extend((depth - 0.25, middle))
+        else:
+            lines.extend((start, depth - 0.1, end, depth - 0.1))
+            texts.extend((middle, depth - 0.25))
+    for layer_index in range(num_vars - 1):
+        for segment_index in range(2**(num_vars - 2 - layer_index)):
+            add(layer_index, segment_index, 2**(layer_index + 1))
+    if num_vars > 0:
+        add(num_vars - 1, 0, 2**(num_vars - 1))
+    return tuple(lines), tuple(texts)
 
 class KVVars(KVDrawable):
     __VAR_TEXT_TAG: str = "KVVar"
 
-    def __init__(self, canvas: Canvas) -> None:
-        super().__init__(canvas)
-        self.__font = tkfont.Font(family=FONTS.TYPE, size=12)
+    def __init__(self, canvas: Canvas, render: DirectRender | None = None) -> None:
+        super().__init__(canvas, render)
+        self.__font: BucketFont = BucketFont(canvas, FONTS.TYPE, KVVars.__VAR_TEXT_TAG, self._render)
         self.__vars: list[str | IDiedString] = []
         self.__top_var_ids: KVVarIDs = KVVarIDs(self.__make_LineTextID_from_index(False), canvas)
         self.__left_var_ids: KVVarIDs = KVVarIDs(self.__make_LineTextID_from_index(True), canvas)
 
-    def update(self, vars: list[str]) -> None:
+    def update(self, vars: list[str]) -> bool:
+        """renames the variables in place and returns whether the number of variables changed (only then the lines need to be drawn again)"""
         if vars == self.__vars:
-            return
+            return False
+        resized: bool = len(vars) != len(self.__vars)
         if len(vars) > len(self.__vars):
             self.__vars.extend(vars[len(self.__vars)::])
         elif len(vars) < len(self.__vars):
@@ -50,39 +62,32 @@ class KVVars(KVDrawable):
         num_top_vars: int = len(vars) - num_left_vars
         self.__top_var_ids.resize(num_top_vars)
         self.__left_var_ids.resize(num_left_vars)
-
+        return resized
 
     def __update_tree_layer(self, old_val: IDiedString | str, new_val: str) -> None:
         if isinstance(old_val, str): return
         old_val.val = new_val
-        self._canvas.itemconfig(f"{KVVars.__VAR_TEXT_TAG}{old_val.id}", text=new_val)
+        self._render.itemconfig(f"{KVVars.__VAR_TEXT_TAG}{old_val.id}", text=new_val)
 
 
+    def resize_font(self, cell_size: float) -> None:
+        """switches the texts to the font size of the ladder that fits cell_size (nothing happens if it stays the same)"""
+        self.__font.set_size(cell_size / 4)
+
     def draw(self, kv_grid: KVGrid) -> None:
         cell_size = kv_grid.cell_size
-        self.__font.configure(size=int(cell_size//4))
+        self.resize_font(cell_size)
         self.__draw_layers(kv_grid, False)
         self.__draw_layers(kv_grid, True)
 
-    def __move_left_text_line(self, line_id: int, text_id: int, coords: _Line) -> None:
-        self._canvas.coords(line_id, coords.layout.grid_offset, coords.start, coords.layout.grid_offset, coords.end)
-        self._canvas.coords(text_id, coords.layout.text_offset, coords.middle)
-    
-    def __move_top_text_line(self, line_id: int, text_id: int, coords: _Line) -> None:
-        self._canvas.coords(line_id, coords.start, coords.layout.grid_offset, coords.end, coords.layout.grid_offset)
-        self._canvas.coords(text_id, coords.middle, coords.layout.text_offset)
-
     def __draw_layers(self, kv_grid: KVGrid, is_left: bool):
         layers = self.__left_var_ids if is_left else self.__top_var_ids
-        move_func = self.__move_left_text_line if is_left else self.__move_top_text_line
-        for index, layer in enumerate(layers):
-            layout = _LayerLayout(index, kv_grid, is_left)
-            [move_func(line_id, text_id, _Line(i, layout)) for i, (line_id, text_id) in enumerate(layer)]
+        pairs: list[LineTextPair] = [pair for layer in layers for pair in layer]
         if layers.val is not None:
-            layout = _LayerLayout(layers.num_vars - 1, kv_grid, is_left)
-            coords = _Line(0, layout)
-            coords.end -= layout.line_length / 2
-            move_func(layers.val.line_id, layers.val.text_id, coords)
+            pairs.append(layers.val)
+        lines, texts = var_points(layers.num_vars, is_left)
+        move_items(self._render, [pair.line_id for pair in pairs], to_canvas(lines, *kv_grid.grid_layout), 4)
+        move_items(self._render, [pair.text_id for pair in pairs], to_canvas(texts, *kv_grid.grid_layout), 2)
 
     def __make_LineTextID_from_index(self, is_left: bool) -> Callable[[int], LineTextPair]:
         angle = 90 if is_left else 0
@@ -95,7 +100,7 @@ class KVVars(KVDrawable):
                 text = string
             return LineTextPair(
                 self._canvas.create_line(0,0,0,0, width=2),
-                self._canvas.create_text(0,0, text=text.val, angle=angle, font=self.__font, tags=(f"{KVVars.__VAR_TEXT_TAG}{text.id}",)),
+                self._canvas.create_text(0,0, text=text.val, angle=angle, font=self.__font.font, tags=(KVVars.__VAR_TEXT_TAG, f"{KVVars.__VAR_TEXT_TAG}{text.id}")),
                 text.id
             )
         return ret_func
\ No newline at end of file
@@ -0,0 +1,46 @@
+from tkinter import Canvas
+
+from .CanvasRender import DirectRender
+
+class LinePool:
+    """line items that get hidden and reused instead of deleted and created again
+    a borrowed line only needs an itemconfig (which can be batched), creating a line always is a round trip into Tcl"""
+    __TAG: str = "LinePool"
+
+    def __init__(self, canvas: Canvas, render: DirectRender) -> None:
+        self.__canvas: Canvas = canvas
+        self.__render: DirectRender = render
+        self.__free: list[int] = []
+        #the number of lines the pool created
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @property
+    def free(self) -> int:
+        return len(self.__free)
+
+    @property
+    def hit_rate(self) -> float:
+        """the part of the borrowed lines that were reused (1.0 if nothing was borrowed yet)"""
+        borrowed: int = self.hits + self.misses
+        return self.hits / borrowed if borrowed else 1.0
+
+    def borrow(self, tag: str, fill: str, width: int) -> int:
+        """a visible line with the given tag and style (its coordinates are left over from the last use)"""
+        if self.__free:
+            self.hits += 1
+            line = self.__free.pop()
+            self.__render.itemconfig(line, state="normal", fill=fill, width=width, tags=tag)
+            return line
+        self.misses += 1
+        self.size += 1
+        return self.__canvas.create_line(0,0,0,0, width=width, fill=fill, tags=(tag,))
+
+    def give_back(self, line: int) -> None:
+        """hides the line and removes its tags, so nothing that works on the tag of its last owner reaches it"""
+        self.__render.itemconfig(line, state="hidden", tags=LinePool.__TAG)
+        self.__free.append(line)
+
+    def __str__(self) -> str:
+        return f"{self.size} lines ({self.free} free), hit rate {self.hit_rate:.0%}"
@@ -18,6 +18,10 @@ class KVColorsMenu(OptionMenu):
     def get_color(self) -> str:
         return self.__current_color.get()
 
+    def select(self, color: str) -> None:
+        """selects a color like a click on its menu entry"""
+        self.__current_color.set(color)
+
     def set_color_from_marking(self, marking: Marking) -> None:
         self.__current_color.set(marking.latex_color)
     
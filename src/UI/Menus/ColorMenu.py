@@ -3,7 +3,7 @@ import re
 from tkinter import Entry, StringVar, Toplevel, Label, Frame, Button
 import Globals.LANGUAGE as lang
 from Globals import DYNAMIC
-from Globals.STATIC import ROOT
+from Globals.STATIC import get_root
 from UI.Popup import Popup
 from UI.ScrollingFrame import ScrollingFrame
 
@@ -29,7 +29,7 @@ class ColorMenu(Toplevel):
     
     def __init__(self) -> None:
         self.colors: dict[str, ColorMenu.ColorItem] = {}
-        super().__init__(ROOT)
+        super().__init__(get_root())
         self.deiconify()
         self.wm_title(lang.MENUBAR.COLORS)
         self.columnconfigure(0, weight=1)
@@ -110,4 +110,4 @@ class ColorMenu(Toplevel):
         DYNAMIC.Colors.clear()
         for colitem in self.colors.values():
             DYNAMIC.Colors[colitem.name] = colitem.value
-        ROOT.event_generate("<<ColorsChanged>>")
\ No newline at end of file
+        get_root().event_generate("<<ColorsChanged>>")
\ No newline at end of file
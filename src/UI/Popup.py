@@ -1,4 +1,4 @@
-from Globals.STATIC import ROOT
+from Globals.STATIC import get_root
 from collections.abc import Callable
 from tkinter import Toplevel, Label, Frame, Button
 
@@ -44,7 +44,8 @@ class Popup:
         return wrapper
 
 def wait_for_pop_up(win: Toplevel, hide: bool = False):
-    if hide: ROOT.withdraw()
-    ROOT.wait_window(win)
-    if hide: ROOT.deiconify()
+    root = get_root()
+    if hide: root.withdraw()
+    root.wait_window(win)
+    if hide: root.deiconify()
     
\ No newline at end of file
@@ -1,18 +1,45 @@
+import os
 import tkinter as tk
+from tkinter import filedialog
 from KV_Diagramm.KVManager import KVManager
 from UI.KVColorsMenu import KVColorsMenu
 from UI.Menus.ColorMenu import ColorMenu
+from UI.Popup import Popup
 from UI.Section import Section
 import Globals.LANGUAGE as lang
 from Globals.STATIC import ROOT, BG_COLOR
 from Globals.STATIC.DEF_KV_VALUES import VARS, VALUES
 from Globals.Funcs import load_config, update_config
+from Profiling.SessionRecorder import SessionRecorder
+from Profiling.Tracer import TRACER, enable_from_environment
 
 #region Menubar
-def build_menubar():
+def build_menubar(kv_manager: KVManager):
     menu = tk.Menu(ROOT)
     #menu.add_command(label=lang.MENUBAR.SETTINGS, command=lambda: None)
     menu.add_command(label=lang.MENUBAR.COLORS, command=ColorMenu)
+    file_types = [("PLA", "*.pla"), ("CSV", "*.csv")]
+
+    def import_table():
+        if path := filedialog.askopenfilename(filetypes=file_types):
+            try:
+                kv_manager.import_table(path)
+            except (OSError, ValueError) as e:
+                IMPORT_FAILED_POP_UP = Popup(lang.ERROR, lang.FILES.IMPORT_FAILED.format(error=e))
+                IMPORT_FAILED_POP_UP.add_button(lang.OK, lambda : None)
+                IMPORT_FAILED_POP_UP.show()
+
+    def export_table():
+        if path := filedialog.asksaveasfilename(filetypes=file_types, defaultextension=".pla"):
+            try:
+                kv_manager.export_table(path)
+            except (OSError, ValueError) as e:
+                EXPORT_FAILED_POP_UP = Popup(lang.ERROR, lang.FILES.EXPORT_FAILED.format(error=e))
+                EXPORT_FAILED_POP_UP.add_button(lang.OK, lambda : None)
+                EXPORT_FAILED_POP_UP.show()
+
+    menu.add_command(label=lang.MENUBAR.IMPORT, command=import_table)
+    menu.add_command(label=lang.MENUBAR.EXPORT, command=export_table)
     ROOT.config(menu=menu)
 #endregion
 #
@@ -23,9 +50,14 @@ def build_KV_Diagram() -> KVManager:
     canvas = tk.Canvas(ROOT, bg=BG_COLOR)
     canvas.grid(row=0, column=0, sticky="nsew")
     kv_manager = KVManager(canvas)
+    if record_path := os.environ.get("KV_RECORD"):
+        kv_manager.recorder = SessionRecorder(record_path)
     canvas.bind("<Configure>", kv_manager.on_resize)
     canvas.bind("<Button-1>", kv_manager.on_left_click)
     canvas.bind("<Button-3>", kv_manager.on_right_click)
+    canvas.bind("<Control-Button-1>", kv_manager.on_select_click)
+    canvas.bind("<Motion>", kv_manager.on_motion)
+    canvas.bind("<Leave>", kv_manager.on_leave)
     return kv_manager
 #endregion
 #
@@ -53,6 +85,20 @@ def build_sidebar(kv_manager: KVManager):
         build_title_input_section(lang.SECTIONS.VALS_FRAME_NAME, vals)
         kv_manager.link_vals(vals)
 
+    def build_expression():
+        expression = tk.StringVar(value="")
+        section, entry = build_title_input_section(lang.SECTIONS.EXPRESSION_FRAME_NAME, expression)
+
+        def apply_expression(event: tk.Event | None = None):
+            try:
+                kv_manager.apply_expression(expression.get())
+            except ValueError as e:
+                EXPRESSION_POP_UP = Popup(lang.ERROR, lang.EXPRESSION_ERROR.format(error=e))
+                EXPRESSION_POP_UP.add_button(lang.OK, lambda : None)
+                EXPRESSION_POP_UP.show()
+        entry.bind("<Return>", apply_expression)
+        tk.Button(section.frame, text=lang.APPLY, command=apply_expression).pack(fill="x", pady=0)
+
     def build_marking_select():
         marking_frame = Section(controls, lang.SECTIONS.MARKING_FRAME_NAME).frame
 
@@ -76,6 +122,7 @@ def build_sidebar(kv_manager: KVManager):
         tk.Button(
             next_prev_frame, text=lang.NEXT, 
             command=lambda : kv_manager.different_marking(1)).grid(row=0, column=2, sticky="ew", padx=0)
+        tk.Button(marking_frame, text=lang.MINIMIZE, command=kv_manager.minimize).pack(fill="x", pady=0)
 
     def build_copy():
         def copy_to_clipboard():
@@ -87,6 +134,7 @@ def build_sidebar(kv_manager: KVManager):
     build_title_input_section(lang.SECTIONS.TITLE_FRAME_NAME, kv_manager.title)
     build_vars()
     build_vals()
+    build_expression()
     build_marking_select()
     build_copy()
 #endregion
@@ -99,13 +147,14 @@ def build_ui():
     ROOT.columnconfigure(0, weight=3)  # Left column (canvas) gets more space
     ROOT.columnconfigure(1, weight=1)  # Right column (controls)
 
-    build_menubar()
-
     kv_manager = build_KV_Diagram()
 
+    build_menubar(kv_manager)
+
     build_sidebar(kv_manager)  # Call the function to update the map
 
 if __name__ == "__main__":
+    trace_path = enable_from_environment()
     load_config()
 
     build_ui()
@@ -113,4 +162,6 @@ if __name__ == "__main__":
     ROOT.mainloop()
 
     update_config()
+    if trace_path:
+        TRACER.write_chrome_trace(trace_path)
 #enregion
\ No newline at end of file
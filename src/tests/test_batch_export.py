@@ -0,0 +1,33 @@
+import os
+import tempfile
+import unittest
+
+from BatchExport import export_all
+from KV_Diagramm.KVBatch import ExportFailure, KVSpec
+
+SPECS: list[KVSpec] = [
+    {"name": "first", "vars": "A,B", "vals": "0110"},
+    {"name": "no_block", "vars": "A,B", "vals": "1001", "markings": [{"indices": [0, 3]}]},
+    {"name": "no_vars", "vals": "01"},
+    {"vars": ["A", "B", "C"], "vals": "01101001", "minimize": True},
+    {"name": "last", "vars": "A,B", "markings": [{"color": "red", "indices": [1, 3]}]},
+]
+
+class TestBatchExport(unittest.TestCase):
+    def export(self, jobs: int, chunk_size: int) -> None:
+        with tempfile.TemporaryDirectory() as out_dir:
+            failures: list[ExportFailure] = []
+            paths = list(export_all(SPECS, out_dir, jobs, chunk_size, failures))
+            self.assertEqual(sorted(os.path.basename(path) for path in paths), ["first.tex", "kv_3.tex", "last.tex"])
+            self.assertEqual(sorted(os.listdir(out_dir)), ["first.tex", "kv_3.tex", "last.tex"])
+            self.assertEqual([(position, name) for position, name, _ in sorted(failures)], [(1, "no_block"), (2, "no_vars")])
+            self.assertIn("don't form a block", sorted(failures)[0][2])
+
+    def test_bad_spec_only_fails_itself(self) -> None:
+        self.export(jobs=1, chunk_size=16)
+
+    def test_bad_spec_only_fails_itself_in_pool(self) -> None:
+        self.export(jobs=2, chunk_size=2)
+
+if __name__ == "__main__":
+    unittest.main()
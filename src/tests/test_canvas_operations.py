@@ -0,0 +1,70 @@
+import unittest
+from collections import Counter
+
+from Profiling.FakeCanvas import FakeCanvas
+from Profiling.SessionReplay import SessionPlayer
+
+class TestCanvasOperations(unittest.TestCase):
+    """the canvas operations of the usual edits don't depend on the size of the diagram
+    (an edit that suddenly touches every cell shows up here long before anyone notices it in the UI)"""
+    NUM_VARS: tuple[int, ...] = (3, 8, 12)
+
+    def setUp(self) -> None:
+        self.canvas = FakeCanvas()
+        self.player = SessionPlayer(self.canvas)
+
+    def start(self, num_vars: int) -> None:
+        self.player.play({"event": "link_colors"})
+        self.player.play({"event": "vars", "value": ",".join(f"x_{k}" for k in range(num_vars))})
+        self.player.play({"event": "vals", "value": "01" * 2**(num_vars - 1)})
+        self.canvas.run_pending()
+
+    def operations(self, event: dict) -> Counter[str]:
+        self.canvas.calls.clear()
+        self.player.play(event) # type: ignore[arg-type]
+        self.canvas.run_pending()
+        return self.canvas.operation_counts()
+
+    def test_value_edit(self) -> None:
+        for num_vars in TestCanvasOperations.NUM_VARS:
+            with self.subTest(num_vars=num_vars):
+                self.setUp()
+                self.start(num_vars)
+                self.assertEqual(self.operations({"event": "vals", "value": "11" + "01" * (2**(num_vars - 1) - 1)}), Counter(itemconfigure=1))
+
+    def test_cell_click(self) -> None:
+        for num_vars in TestCanvasOperations.NUM_VARS:
+            with self.subTest(num_vars=num_vars):
+                self.setUp()
+                self.start(num_vars)
+                self.assertEqual(self.operations({"event": "left_click", "index": 1}), Counter(create=1, coords=1))
+                #the marking already has its line, growing it only moves it
+                self.assertEqual(self.operations({"event": "left_click", "index": 3}), Counter(coords=1))
+
+    def test_variable_rename(self) -> None:
+        for num_vars in TestCanvasOperations.NUM_VARS:
+            with self.subTest(num_vars=num_vars):
+                self.setUp()
+                self.start(num_vars)
+                names = [f"x_{k}" for k in range(num_vars)]
+                names[0] = "y"
+                self.assertEqual(self.operations({"event": "vars", "value": ",".join(names)}), Counter(itemconfigure=1))
+
+    def test_resize_step(self) -> None:
+        for num_vars in TestCanvasOperations.NUM_VARS:
+            with self.subTest(num_vars=num_vars):
+                self.setUp()
+                self.start(num_vars)
+                self.canvas.calls.clear()
+                self.canvas.width, self.canvas.height = 810, 605
+                #only the scaling step, the exact relayout waits until the canvas stops changing its size
+                self.player.manager.on_resize(None) # type: ignore[arg-type]
+                operations = self.canvas.operation_counts()
+                self.assertEqual((operations.pop("scale", 0), operations.pop("move", 0)), (1, 1))
+                #crossing a font size bucket switches the font of each text group (grid, variables, values, indices) by its tag
+                self.assertLessEqual(operations.pop("itemconfigure", 0), 4)
+                self.assertLessEqual(operations.pop("font", 0), 4)
+                self.assertEqual(operations, Counter())
+
+if __name__ == "__main__":
+    unittest.main()
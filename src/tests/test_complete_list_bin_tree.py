@@ -0,0 +1,54 @@
+import unittest
+from itertools import count
+
+from DataStructures.CompleteListBinTree import CompleteListBinTree
+
+def preorder_layers(nodes: list[int], height: int) -> list[list[int]]:
+    """the layers (layer 0 are the leafes) of a complete tree stored in preorder, walked node by node"""
+    layers: list[list[int]] = [[] for _ in range(height)]
+    def walk(index: int, layer: int) -> int:
+        layers[layer].append(nodes[index])
+        index += 1
+        if layer > 0:
+            index = walk(index, layer - 1)
+            index = walk(index, layer - 1)
+        return index
+    if height > 0:
+        walk(0, height - 1)
+    return layers
+
+class TestCompleteListBinTree(unittest.TestCase):
+    def setUp(self) -> None:
+        ids = count()
+        self.tree: CompleteListBinTree[int] = CompleteListBinTree(lambda _: next(ids))
+
+    def assert_layers(self) -> None:
+        height = self.tree.height
+        expected = preorder_layers(list(self.tree._nodes), height)
+        for layer in range(height):
+            with self.subTest(height=height, layer=layer):
+                self.assertEqual(list(self.tree.get_tree_layer(layer)), expected[layer])
+        self.assertEqual([list(layer) for layer in self.tree.get_tree_layers()], expected[::-1])
+
+    def test_layers_while_growing(self) -> None:
+        """every layer has to stay inside the node list, not only the root (the leafes used to be read past the end)"""
+        for _ in range(8):
+            self.tree.add_layer(-self.tree.height - 1)
+            self.assert_layers()
+
+    def test_layers_after_removing(self) -> None:
+        self.tree.add_layers(7)
+        for _ in range(6):
+            self.tree.remove_layers()
+            self.assert_layers()
+
+    def test_layers_after_clear(self) -> None:
+        self.tree.add_layers(4)
+        self.tree.clear()
+        self.assertEqual(self.tree.height, 0)
+        self.assertEqual(list(self.tree.get_tree_layers()), [])
+        self.tree.add_layers(3)
+        self.assert_layers()
+
+if __name__ == "__main__":
+    unittest.main()
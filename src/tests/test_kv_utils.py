@@ -0,0 +1,27 @@
+import importlib.util
+import unittest
+
+from KV_Diagramm import KVUtils
+
+@unittest.skipIf(importlib.util.find_spec("numpy") is None, "numpy is not installed")
+class TestLookupArrays(unittest.TestCase):
+    def test_index_to_coordinate_array(self) -> None:
+        for num_vars in range(1, 13):
+            with self.subTest(num_vars=num_vars):
+                xs, ys = KVUtils.index_to_coordinate_array(num_vars)
+                self.assertEqual(list(zip(xs.tolist(), ys.tolist())), list(KVUtils.index_to_coordinate_table(num_vars)))
+
+    def test_coordinate_to_index_array(self) -> None:
+        for num_vars in range(1, 13):
+            with self.subTest(num_vars=num_vars):
+                table = KVUtils.coordinate_to_index_array(num_vars)
+                self.assertEqual(table.shape, KVUtils.get_kv_dimensions(num_vars)[::-1])
+                self.assertEqual(tuple(map(tuple, table.tolist())), KVUtils.coordinate_to_index_table(num_vars))
+
+    def test_arrays_are_read_only(self) -> None:
+        xs, _ = KVUtils.index_to_coordinate_array(4)
+        with self.assertRaises(ValueError):
+            xs[0] = 1
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+from itertools import product
+
+from KV_Diagramm import KVUtils
+from KV_Diagramm.Dataclasses.Cube import Cube
+from KV_Diagramm.Dataclasses.Marking import MarkingData
+
+def sort_key(data: MarkingData) -> tuple[float, float]:
+    return data.y1, data.x1
+
+class TestMarkingData(unittest.TestCase):
+    def test_from_cube_agrees_with_from_indices(self) -> None:
+        """the closed form and the flood fill give the same rectangles for every cube of up to 6 variables"""
+        for num_vars in range(7):
+            width, height = KVUtils.get_kv_dimensions(num_vars)
+            for bits in product(range(3), repeat=num_vars):
+                free_mask = sum(1 << i for i, b in enumerate(bits) if b == 2)
+                value = sum(1 << i for i, b in enumerate(bits) if b == 1)
+                cube = Cube(free_mask, value)
+                with self.subTest(num_vars=num_vars, cube=cube):
+                    closed_form = sorted(MarkingData.from_cube(cube, width, height), key=sort_key)
+                    flood_fill = sorted(MarkingData.from_indices(cube.indices(), width, height), key=sort_key)
+                    self.assertEqual(closed_form, flood_fill)
+
+    def test_from_cube_without_cube(self) -> None:
+        self.assertEqual(MarkingData.from_cube(None, 4, 4), [])
+
+if __name__ == "__main__":
+    unittest.main()
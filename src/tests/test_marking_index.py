@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from KV_Diagramm import KVUtils
+from KV_Diagramm.Dataclasses.Cube import Cube
+from KV_Diagramm.Dataclasses.KVData import KVData
+from KV_Diagramm.MarkingIndex import MarkingIndex
+
+class TestMarkingIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.kv_data = KVData()
+        self.kv_data.set_vars([f"x_{k}" for k in range(8)])
+        self.index = MarkingIndex()
+        self.kv_data.subscribe(self.index.on_kv_data_changed)
+
+    def assert_matches_markings(self) -> None:
+        for cell in range(256):
+            expected = {m.TAG for m in self.kv_data.markings if m.cube is not None and cell in m.cube}
+            self.assertEqual(set(self.index.tags_at(cell)), expected, f"cell {cell}")
+
+    def test_follows_expanding_and_shrinking(self) -> None:
+        rng = random.Random(0)
+        markings = [self.kv_data.add_marking("red", f"m{i}") for i in range(50)]
+        for step in range(2000):
+            marking = rng.choice(markings)
+            index = rng.randrange(256)
+            cube = marking.cube
+            if cube is None:
+                self.kv_data.set_marking_cube(marking, Cube(0, index))
+            elif rng.random() < 0.6 and (bit := KVUtils.get_different_bit(index, cube)) is not None:
+                self.kv_data.set_marking_cube(marking, KVUtils.expand_block(cube, bit))
+            elif index in cube and len(cube) > 1:
+                self.kv_data.set_marking_cube(marking, KVUtils.shrink_block(cube, index, marking.expansion_order[-1]))
+            elif rng.random() < 0.1:
+                self.kv_data.set_marking_cube(marking, None)
+            if step % 200 == 0:
+                self.assert_matches_markings()
+        self.assert_matches_markings()
+
+    def test_replaced_and_removed_markings(self) -> None:
+        marking = self.kv_data.add_marking("red", "m")
+        self.kv_data.set_marking_cube(marking, Cube(0b11, 0))
+        self.kv_data.set_marking_cube(marking, Cube(0b1100, 0b10000))
+        self.assert_matches_markings()
+        with self.kv_data.batch():
+            self.kv_data.set_marking_cube(marking, Cube(0, 5))
+            self.kv_data.set_marking_cube(marking, Cube(0b1, 6))
+        self.assertEqual(list(self.index.markings_at(7)), [marking])
+        self.kv_data.remove_marking(0)
+        self.assertEqual(list(self.index.tags_at(7)), [])
+        self.assert_matches_markings()
+
+if __name__ == "__main__":
+    unittest.main()
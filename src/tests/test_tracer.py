@@ -0,0 +1,54 @@
+import unittest
+
+from Profiling.FakeCanvas import FakeCanvas
+from Profiling.SessionReplay import SessionPlayer
+from Profiling.Tracer import TRACER
+
+class TestFrameCounts(unittest.TestCase):
+    def setUp(self) -> None:
+        self.canvas = FakeCanvas()
+        self.player = SessionPlayer(self.canvas)
+        self.player.play({"event": "link_colors"})
+        self.player.play({"event": "vars", "value": "A,B,C"})
+        self.player.play({"event": "vals", "value": "01101001"})
+        self.canvas.run_pending()
+        TRACER.clear()
+        #every frame counts as slow, so every one gets logged
+        TRACER.enable(budget_ms=-1)
+
+    def tearDown(self) -> None:
+        TRACER.disable()
+        TRACER.clear()
+
+    def frame(self, name: str) -> dict:
+        return next(event for event in TRACER.events if event["name"] == name)
+
+    def test_counts_reach_the_frame(self) -> None:
+        with self.assertLogs("KV.trace") as logs:
+            self.player.play({"event": "left_click", "index": 1})
+        args = self.frame("KVDrawer.update")["args"]
+        self.assertEqual((args["line_pool_hits"], args["line_pool_misses"], args["line_pool_size"]), (0, 1, 1))
+        self.assertEqual(args["font_switches"], 0)
+        self.assertGreater(args["round_trips"], 0)
+        self.assertIn("round_trips", logs.output[-1])
+        self.assertIn("line_pool_misses 1", logs.output[-1])
+
+    def test_frame_sums_its_steps(self) -> None:
+        with self.assertLogs("KV.trace"), TRACER.span("frame"):
+            self.player.play({"event": "left_click", "index": 1})
+            self.player.play({"event": "left_click", "index": 3})
+        updates = [event["args"] for event in TRACER.events if event["name"] == "KVDrawer.update"]
+        frame = self.frame("frame")["args"]
+        self.assertEqual(frame["round_trips"], sum(update["round_trips"] for update in updates))
+        self.assertEqual(frame["line_pool_misses"], 1)
+
+    def test_resize_step(self) -> None:
+        self.canvas.width, self.canvas.height = 1600, 1200
+        with self.assertLogs("KV.trace"):
+            self.player.manager.on_resize(None) # type: ignore[arg-type]
+        args = self.frame("KVManager.on_resize")["args"]
+        self.assertGreater(args["round_trips"], 0)
+        self.assertGreater(args["font_switches"], 0)
+
+if __name__ == "__main__":
+    unittest.main()